@@ -1,15 +1,35 @@
 """
 auth package — OpenCivil authentication
+
+Submodules load on first attribute access, so importing e.g. Database
+doesn't pull in Qt or the OAuth stack.
 """
-from .manager      import GoogleAuthManager
-from .dialog       import LoginDialog
-from .config       import GoogleAuthConfig
-from .user_widget  import UserProfileWidget
-from .db           import Database
-from . import      email_auth
+import importlib
+
+from . import _env  # noqa: F401  (loads .env)
+
+_LAZY = {
+    "GoogleAuthManager": ".manager",
+    "LoginDialog":       ".dialog",
+    "GoogleAuthConfig":  ".config",
+    "UserProfileWidget": ".user_widget",
+    "Database":          ".db",
+    "email_auth":        ".email_auth",
+}
 
 __all__ = [
     "GoogleAuthManager", "LoginDialog",
     "GoogleAuthConfig",  "UserProfileWidget",
     "Database",          "email_auth",
 ]
+
+def __getattr__(name):
+    if name in _LAZY:
+        mod = importlib.import_module(_LAZY[name], __name__)
+        obj = mod if name == "email_auth" else getattr(mod, name)
+        globals()[name] = obj
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return list(globals()) + list(_LAZY)
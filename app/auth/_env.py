@@ -0,0 +1,11 @@
+"""
+Loads the project .env once per process. Imported by the package
+__init__, so every auth submodule sees the variables.
+"""
+from pathlib import Path
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+ENV_FILE = ROOT_DIR / ".env"
+
+load_dotenv(ENV_FILE)
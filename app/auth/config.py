@@ -1,11 +1,6 @@
 import os
+from functools import cache
 from pathlib import Path
-from dotenv import load_dotenv
-
-_here = Path(__file__).resolve()                                 
-_root = _here.parent.parent.parent                       
-
-load_dotenv(_root / ".env")
 
 class GoogleAuthConfig:
     """Google OAuth2 configuration for OpenCivil."""
@@ -21,14 +16,17 @@ class GoogleAuthConfig:
 
     USER_INFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
 
-    CREDENTIALS_DIR  = os.path.join(os.path.expanduser("~"), ".opencivil")
-    CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "user_credentials.json")
+    CREDENTIALS_DIR  = Path.home() / ".opencivil"
+    CREDENTIALS_FILE = CREDENTIALS_DIR / "user_credentials.json"
 
+    # Config is fixed after import, so both of these are computed once.
     @classmethod
+    @cache
     def validate(cls) -> bool:
         return bool(cls.CLIENT_ID and cls.CLIENT_SECRET)
 
     @classmethod
+    @cache
     def as_client_config(cls) -> dict:
         return {
             "installed": {
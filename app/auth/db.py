@@ -1,20 +1,131 @@
 import os
+import time
+import hashlib
+import queue
+import atexit
 import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
-from dotenv import load_dotenv
-from pymongo import MongoClient, ASCENDING
-from pymongo.errors import ConnectionFailure
-
-_root = Path(__file__).resolve().parent.parent.parent
-load_dotenv(_root / ".env")
+from pymongo import MongoClient, ASCENDING, ReturnDocument, UpdateOne
+from pymongo.collation import Collation
+from pymongo.errors import ConnectionFailure, OperationFailure
 
 logger  = logging.getLogger(__name__)
 DB_NAME = "opencivil"
 
+# Case-insensitive equality on email. Every email-keyed query passes this so
+# it can use the collated indexes below.
+EMAIL_COLLATION = Collation(locale="en", strength=2)
+
+USERS_SCHEMA = {
+    "$jsonSchema": {
+        "bsonType": "object",
+        "required": ["email"],
+        "properties": {
+            "email": {"bsonType": "string", "pattern": r"^[^A-Z\s]+$"},
+        },
+    }
+}
+
+# Everything email_auth reads from a user; codes and timestamps stay server-side.
+PROJECTION_AUTH = {
+    "password_hash": 1, "verified": 1, "name": 1, "email": 1, "provider": 1,
+    "picture": 1,
+}
+
+USER_CACHE_TTL      = 60.0
+USER_CACHE_MISS_TTL = 5.0
+USER_CACHE_MAXSIZE  = 10_000
+
+_now_cv: ContextVar[Optional[datetime]] = ContextVar("now", default=None)
+
+def _now() -> datetime:
+    return _now_cv.get() or datetime.now(timezone.utc)
+
+@contextmanager
+def request_clock():
+    """Pin one UTC timestamp for every db write made inside the block."""
+    token = _now_cv.set(datetime.now(timezone.utc))
+    try:
+        yield
+    finally:
+        _now_cv.reset(token)
+
+@lru_cache(maxsize=4096)
+def _norm(email: str) -> str:
+    return email.lower().strip()
+
+class _UserCache:
+    """
+    Small in-process TTL cache for user documents, keyed by normalized email.
+    Misses (None) are cached too, with a shorter TTL, so repeated lookups of
+    an unknown address don't each hit MongoDB.
+    """
+
+    def __init__(self, maxsize, ttl, miss_ttl):
+        self._maxsize  = maxsize
+        self._ttl      = ttl
+        self._miss_ttl = miss_ttl
+        self._data     = {}
+        self._lock     = threading.RLock()
+
+    def get(self, key):
+        """Return (hit, doc)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires, doc = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return False, None
+            return True, doc
+
+    def put(self, key, doc):
+        ttl = self._ttl if doc is not None else self._miss_ttl
+        with self._lock:
+            if key not in self._data and len(self._data) >= self._maxsize:
+                self._evict()
+            self._data[key] = (time.monotonic() + ttl, doc)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self):
+        now = time.monotonic()
+        stale = [k for k, (exp, _) in self._data.items() if exp < now]
+        for k in stale:
+            del self._data[k]
+        if len(self._data) >= self._maxsize:
+            del self._data[next(iter(self._data))]
+
+_user_cache = _UserCache(USER_CACHE_MAXSIZE, USER_CACHE_TTL, USER_CACHE_MISS_TTL)
+
+# Bump INDEX_SPEC_VERSION whenever _ensure_indexes changes, so hosts with a
+# stale marker re-check the cluster.
+INDEX_SPEC_VERSION = 1
+INDEX_CACHE_FILE   = Path.home() / ".opencivil" / ".index_cache"
+
+MONGO_MAX_POOL = int(os.getenv("MONGO_MAX_POOL", "50"))
+MONGO_MIN_POOL = int(os.getenv("MONGO_MIN_POOL", "5"))
+
 class Database:
+    """
+    Process-wide MongoDB handle. One MongoClient (and therefore one
+    connection pool) is shared by every caller in the process; forked
+    children drop it and build their own on first use.
+    """
     _client: Optional[MongoClient] = None
     _db = None
 
@@ -30,20 +141,99 @@ class Database:
             cls._client = MongoClient(
                 uri,
                 serverSelectionTimeoutMS=5000,
+                maxPoolSize=MONGO_MAX_POOL,
+                minPoolSize=MONGO_MIN_POOL,
+                maxIdleTimeMS=60_000,
+                waitQueueTimeoutMS=2000,
+                retryWrites=True,
+                compressors="zstd,snappy,zlib",
+                zlibCompressionLevel=3,
                 tlsCAFile=certifi.where()
             )
-            cls._client.admin.command('ping')
+            # No ping: pymongo connects lazily and the first real query
+            # raises ServerSelectionTimeoutError if the server is unreachable.
             cls._db = cls._client[DB_NAME]
-            cls._ensure_indexes()
-            logger.info("MongoDB connected: %s", DB_NAME)
+            threading.Thread(target=cls._ensure_indexes_safe,
+                             name="mongo-ensure-indexes", daemon=True).start()
+            logger.info("MongoDB client created: %s", DB_NAME)
         except ConnectionFailure as exc:
             cls._client = None
             logger.error("MongoDB connection failed: %s", exc)
             raise
 
+    @classmethod
+    def _ensure_indexes_safe(cls):
+        try:
+            cls._ensure_indexes()
+        except Exception as exc:
+            logger.error("Index setup failed: %s", exc)
+
     @classmethod
     def _ensure_indexes(cls):
-        cls._db["users"].create_index([("email", ASCENDING)], unique=True)
+        marker = cls._index_marker()
+        if cls._read_index_cache() == marker:
+            return
+
+        users    = cls._db["users"]
+        existing = {i["name"] for i in users.list_indexes()}
+        complete = True
+
+        if "email_ci_unique" not in existing:
+            try:
+                users.create_index([("email", ASCENDING)], unique=True,
+                                   collation=EMAIL_COLLATION, name="email_ci_unique")
+                existing.add("email_ci_unique")
+            except OperationFailure as exc:
+                # Legacy mixed-case duplicates block the collated index; keep the
+                # old exact-match one until they are cleaned up.
+                logger.warning("Could not build case-insensitive email index: %s", exc)
+                complete = False
+                if "email_1" not in existing:
+                    users.create_index([("email", ASCENDING)], unique=True)
+        if "email_ci_unique" in existing and "email_1" in existing:
+            users.drop_index("email_1")
+
+        for field, name in (("reset_code",  "email_resetcode_partial"),
+                            ("verify_code", "email_verifycode_partial")):
+            if name in existing:
+                continue
+            users.create_index(
+                [("email", ASCENDING), (field, ASCENDING)],
+                partialFilterExpression={field: {"$type": "string"}},
+                collation=EMAIL_COLLATION,
+                name=name,
+            )
+
+        try:
+            cls._db.command("collMod", "users", validator=USERS_SCHEMA,
+                            validationLevel="moderate")
+        except OperationFailure as exc:
+            logger.warning("Could not apply users schema validator: %s", exc)
+            complete = False
+
+        if complete:
+            cls._write_index_cache(marker)
+
+    @staticmethod
+    def _index_marker():
+        uri = os.getenv("MONGO_URI", "")
+        digest = hashlib.sha1(f"{uri}|{DB_NAME}".encode()).hexdigest()
+        return f"{INDEX_SPEC_VERSION}:{digest}"
+
+    @staticmethod
+    def _read_index_cache():
+        try:
+            return INDEX_CACHE_FILE.read_text().strip()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write_index_cache(marker):
+        try:
+            INDEX_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            INDEX_CACHE_FILE.write_text(marker)
+        except OSError as exc:
+            logger.debug("Could not write index cache: %s", exc)
 
     @classmethod
     def users(cls):
@@ -51,59 +241,208 @@ class Database:
             cls.connect()
         return cls._db["users"]
 
-def create_user(name, email, password_hash, provider="email"):
-    now = datetime.now(timezone.utc)
-    doc = {
+    @classmethod
+    def _reset_after_fork(cls):
+        # pymongo clients are not fork-safe; the child must open its own pool.
+        cls._client = None
+        cls._db     = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=Database._reset_after_fork)
+
+def _new_user_doc(name, email, password_hash, provider, now, verify_code=None):
+    return {
         "name":          name,
-        "email":         email.lower().strip(),
+        "email":         _norm(email),
         "password_hash": password_hash,
         "provider":      provider,
         "verified":      False,
-        "verify_code":   None,
+        "verify_code":   verify_code,
         "reset_code":    None,
         "reset_expires": None,
         "created_at":    now,
         "last_login":    None,
     }
+
+def create_user(name, email, password_hash, provider="email", verify_code=None):
+    now = _now()
+    doc = _new_user_doc(name, email, password_hash, provider, now, verify_code)
     Database.users().insert_one(doc)
+    _user_cache.pop(doc["email"])
     return doc
 
+def delete_user(email, unverified_only=False):
+    k = _norm(email)
+    query = {"email": k, "verified": False} if unverified_only else {"email": k}
+    Database.users().delete_one(query, collation=EMAIL_COLLATION)
+    _user_cache.pop(k)
+
+def create_users(users):
+    """
+    Bulk insert for imports / signup batches. `users` is an iterable of
+    dicts with name, email, password_hash and optional provider.
+    Sent as one unordered insert_many, so a duplicate doesn't stop the rest.
+    """
+    now  = _now()
+    docs = [_new_user_doc(u["name"], u["email"], u["password_hash"],
+                          u.get("provider", "email"), now)
+            for u in users]
+    if not docs:
+        return docs
+    try:
+        Database.users().insert_many(docs, ordered=False,
+                                     bypass_document_validation=True)
+    finally:
+        for d in docs:
+            _user_cache.pop(d["email"])
+    return docs
+
 def get_user_by_email(email):
-    return Database.users().find_one({"email": email.lower().strip()})
+    k = _norm(email)
+    hit, doc = _user_cache.get(k)
+    if hit:
+        return doc
+    doc = Database.users().find_one({"email": k}, PROJECTION_AUTH,
+                                    collation=EMAIL_COLLATION)
+    _user_cache.put(k, doc)
+    return doc
+
+def get_users_by_emails(emails, fields=None):
+    """Fetch several users in one query. Returns {email: doc}."""
+    norm = list({_norm(e) for e in emails})
+    if not norm:
+        return {}
+    cur = Database.users().find({"email": {"$in": norm}}, projection=fields,
+                                collation=EMAIL_COLLATION)
+    return {d["email"]: d for d in cur}
 
 def set_verify_code(email, code):
-    Database.users().update_one(
-        {"email": email.lower().strip()},
-        {"$set": {"verify_code": code}}
+    """Store a new code on an unverified email account. Returns its doc, or None."""
+    k = _norm(email)
+    doc = Database.users().find_one_and_update(
+        {"email": k, "provider": "email", "verified": False},
+        {"$set": {"verify_code": code}},
+        projection={"name": 1},
+        collation=EMAIL_COLLATION,
     )
+    _user_cache.pop(k)
+    return doc
 
 def verify_user(email, code):
-    result = Database.users().update_one(
-        {"email": email.lower().strip(), "verify_code": code},
-        {"$set": {"verified": True, "verify_code": None}}
+    """Mark the user verified. Returns the updated doc, or None on a bad code."""
+    k = _norm(email)
+    doc = Database.users().find_one_and_update(
+        {"email": k, "verify_code": code},
+        {"$set": {"verified": True, "verify_code": None}},
+        projection={"password_hash": 0},
+        return_document=ReturnDocument.AFTER,
+        collation=EMAIL_COLLATION,
     )
-    return result.modified_count > 0
+    _user_cache.pop(k)
+    return doc
 
 def set_reset_code(email, code, expires):
+    """``expires`` is a Unix timestamp (int seconds)."""
+    k = _norm(email)
     Database.users().update_one(
-        {"email": email.lower().strip()},
-        {"$set": {"reset_code": code, "reset_expires": expires}}
+        {"email": k},
+        {"$set": {"reset_code": code, "reset_expires": expires}},
+        collation=EMAIL_COLLATION,
     )
+    _user_cache.pop(k)
+
+def update_password_hash(email, old_hash, new_hash):
+    """Swap in a rehashed password, unless it changed since old_hash was read."""
+    k = _norm(email)
+    Database.users().update_one(
+        {"email": k, "password_hash": old_hash},
+        {"$set": {"password_hash": new_hash}},
+        collation=EMAIL_COLLATION,
+    )
+    _user_cache.pop(k)
 
 def reset_password(email, code, new_hash):
-    now = datetime.now(timezone.utc)
-    result = Database.users().update_one(
-        {"email":         email.lower().strip(),
+    """Set a new password hash. Returns the updated doc, or None on a bad/expired code."""
+    k   = _norm(email)
+    now = int(_now().timestamp())
+    doc = Database.users().find_one_and_update(
+        {"email":         k,
          "reset_code":    code,
          "reset_expires": {"$gt": now}},
         {"$set": {"password_hash": new_hash,
                   "reset_code":    None,
-                  "reset_expires": None}}
+                  "reset_expires": None}},
+        projection={"password_hash": 0},
+        return_document=ReturnDocument.AFTER,
+        collation=EMAIL_COLLATION,
     )
-    return result.modified_count > 0
+    _user_cache.pop(k)
+    return doc
+
+class _LoginTimestampWriter:
+    """
+    Records last_login off the auth path. Logins are queued and a daemon
+    thread flushes them roughly once a second as one unordered
+    bulk_write, keeping only the latest timestamp per email.
+    """
+
+    FLUSH_INTERVAL = 1.0
+    BATCH_SIZE     = 500
+
+    def __init__(self):
+        self._queue  = queue.Queue(maxsize=10_000)
+        self._thread = None
+        self._lock   = threading.Lock()
+
+    def enqueue(self, email):
+        self._start()
+        try:
+            self._queue.put_nowait((email, _now()))
+        except queue.Full:
+            logger.warning("last_login queue full; dropping update for %s", email)
+
+    def flush(self):
+        latest = {}
+        while len(latest) < self.BATCH_SIZE:
+            try:
+                email, ts = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if email not in latest or ts > latest[email]:
+                latest[email] = ts
+        if not latest:
+            return
+        ops = [UpdateOne({"email": e}, {"$set": {"last_login": ts}},
+                         collation=EMAIL_COLLATION)
+               for e, ts in latest.items()]
+        try:
+            # Acknowledged (w=1): unacknowledged writes reject the collation
+            # the case-insensitive email index needs.
+            Database.users().bulk_write(ops, ordered=False)
+        except Exception as exc:
+            logger.error("Failed to write last_login batch: %s", exc)
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="last-login-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self._drain)
+
+    def _run(self):
+        while True:
+            time.sleep(self.FLUSH_INTERVAL)
+            self._drain()
+
+    def _drain(self):
+        while not self._queue.empty():
+            self.flush()
+
+_login_writer = _LoginTimestampWriter()
 
 def update_last_login(email):
-    Database.users().update_one(
-        {"email": email.lower().strip()},
-        {"$set": {"last_login": datetime.now(timezone.utc)}}
-    )
+    # last_login is never read on the auth path, so the cached user stays valid.
+    _login_writer.enqueue(_norm(email))
@@ -7,14 +7,15 @@ IBM blue (#0F62FE) as the single accent. All backend logic preserved.
 """
 
 import os
-import random
+from functools import lru_cache
+import numpy as np
 from PyQt6.QtCore import (
     Qt, QTimer, QPropertyAnimation, QEasingCurve,
-    QPoint, pyqtProperty, QRect
+    QPoint, pyqtProperty, QRect, QSize
 )
 from PyQt6.QtGui import (
     QFont, QColor, QPainter, QPainterPath, QLinearGradient,
-    QBrush, QPen, QPixmap, QIcon, QFontDatabase
+    QBrush, QPen, QPixmap, QPixmapCache, QImage, QIcon, QFontDatabase
 )
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
@@ -23,8 +24,7 @@ from PyQt6.QtWidgets import (
     QApplication, QSpacerItem
 )
 
-from .thread import GoogleAuthThread
-from . import email_auth
+from .thread import GoogleAuthThread, EmailAuthThread
 
 BG            = "#F5F4F0"                            
 SURFACE       = "#FFFFFF"
@@ -47,21 +47,135 @@ GOOGLE_BG     = "#FFFFFF"
 GOOGLE_BORDER = "#DDDBD6"
 GOOGLE_HOVER  = "#F0EFEb"
 
+# One stylesheet per dialog, parsed once. Widgets pick rules up through
+# object names; focus/error states flip a dynamic property and re-polish
+# instead of re-parsing CSS.
+_STYLESHEET = f"""
+    QLineEdit {{
+        background: {INPUT_BG};
+        border: 1px solid {INPUT_BORDER};
+        border-radius: 6px;
+        padding: 0 12px;
+        color: {TEXT_PRIMARY};
+        font-size: 13px;
+        selection-background-color: {ACCENT};
+    }}
+    QLineEdit[focused="true"] {{
+        border: 1.5px solid {INPUT_FOCUS};
+    }}
+    QLineEdit::placeholder {{
+        color: {TEXT_HINT};
+    }}
+
+    QLabel#primaryText   {{ color: {TEXT_PRIMARY}; }}
+    QLabel#secondaryText {{ color: {TEXT_SECONDARY}; }}
+    QLabel#errorText     {{ color: {ERROR_COLOR}; }}
+    QLabel#logoGlyph     {{ color: {ACCENT}; font-size: 18px; }}
+    QLabel#status                 {{ color: {TEXT_SECONDARY}; font-size: 11px; }}
+    QLabel#status[error="true"]   {{ color: {ERROR_COLOR}; }}
+
+    QCheckBox {{
+        color: {TEXT_SECONDARY};
+        spacing: 6px;
+    }}
+    QCheckBox::indicator {{
+        width: 14px; height: 14px;
+        border: 1px solid {INPUT_BORDER};
+        border-radius: 3px;
+        background: {INPUT_BG};
+    }}
+    QCheckBox::indicator:checked {{
+        background: {ACCENT};
+        border-color: {ACCENT};
+    }}
+
+    QPushButton#primary {{
+        background: {ACCENT};
+        border: none;
+        border-radius: 6px;
+        color: {ACCENT_TEXT};
+        font-size: 13px;
+        font-weight: 600;
+    }}
+    QPushButton#primary:hover   {{ background: {ACCENT_HOVER}; }}
+    QPushButton#primary:pressed {{ background: {ACCENT_PRESSED}; }}
+    QPushButton#primary:disabled {{
+        background: {INPUT_BORDER};
+        color: {TEXT_HINT};
+    }}
+
+    QPushButton#google {{
+        background: {GOOGLE_BG};
+        border: 1px solid {GOOGLE_BORDER};
+        border-radius: 6px;
+        color: {TEXT_PRIMARY};
+        font-size: 13px;
+        font-weight: 600;
+        padding-left: 8px;
+        text-align: center;
+    }}
+    QPushButton#google:hover    {{ background: {GOOGLE_HOVER}; border-color: {BORDER_STRONG}; }}
+    QPushButton#google:pressed  {{ background: #E8E7E3; }}
+    QPushButton#google:disabled {{ color: {TEXT_HINT}; }}
+
+    QPushButton#toggle {{
+        color: {ACCENT};
+        border: none;
+        background: transparent;
+        padding: 0;
+        margin-left: 4px;
+    }}
+    QPushButton#toggle:hover {{ color: {ACCENT_HOVER}; }}
+"""
+
+_GOOGLE_ICON_SIZE = QSize(20, 20)
+
+_FORGOT_LINK_HTML = (
+    f'<a href="#" style="color:{TEXT_SECONDARY};text-decoration:none;">'
+    f'Forgot password?</a>'
+)
+
 def _make_noise_pixmap(width: int, height: int, density: float = 0.04) -> QPixmap:
     """Return a subtle grain overlay pixmap — drawn once, reused on repaint."""
-    rng = random.Random(0xC17117)                                        
-    pm = QPixmap(width, height)
-    pm.fill(Qt.GlobalColor.transparent)
-    p = QPainter(pm)
+    rng = np.random.default_rng(0xC17117)
     total = int(width * height * density)
-    for _ in range(total):
-        x = rng.randint(0, width - 1)
-        y = rng.randint(0, height - 1)
-        alpha = rng.randint(4, 14)
-        p.setPen(QColor(30, 28, 20, alpha))
-        p.drawPoint(x, y)
-    p.end()
-    return pm
+    xs = rng.integers(0, width, total)
+    ys = rng.integers(0, height, total)
+    a  = rng.integers(4, 15, total, dtype=np.uint32)
+
+    # Premultiplied ARGB32 words for QColor(30, 28, 20, a).
+    r = (30 * a + 127) // 255
+    g = (28 * a + 127) // 255
+    b = (20 * a + 127) // 255
+    px = (a << 24) | (r << 16) | (g << 8) | b
+
+    img = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    img.fill(0)
+    ptr = img.bits()
+    ptr.setsize(img.sizeInBytes())
+    buf = np.frombuffer(ptr, dtype=np.uint32).reshape(height, img.bytesPerLine() // 4)
+    buf[ys, xs] = px
+    return QPixmap.fromImage(img)
+
+@lru_cache(maxsize=None)
+def _font(family: str, size: int) -> QFont:
+    """
+    Shared QFont per (family, size). QFont is implicitly shared, so handing
+    the same instance to setFont() only bumps a refcount. Built lazily
+    because QFont needs a QGuiApplication.
+    """
+    return QFont(family, size)
+
+NOISE_TILE = 128
+
+@lru_cache(maxsize=8)
+def _cached_noise(width: int, height: int, density: float = 0.04) -> QPixmap:
+    return _make_noise_pixmap(width, height, density)
+
+@lru_cache(maxsize=1)
+def _noise_brush() -> QBrush:
+    """One small grain tile shared by every dialog; Qt tiles the brush when filling."""
+    return QBrush(_cached_noise(NOISE_TILE, NOISE_TILE))
 
 class StyledInput(QLineEdit):
     def __init__(self, placeholder="", password=False, parent=None):
@@ -70,26 +184,12 @@ class StyledInput(QLineEdit):
         if password:
             self.setEchoMode(QLineEdit.EchoMode.Password)
         self.setFixedHeight(42)
-        self.setFont(QFont("Segoe UI", 10))
-        self._apply_style(focused=False)
+        self.setFont(_font("Segoe UI", 10))
+        self.setProperty("focused", False)
 
     def _apply_style(self, focused: bool):
-        border = INPUT_FOCUS if focused else INPUT_BORDER
-        bw = "1.5px" if focused else "1px"
-        self.setStyleSheet(f"""
-            QLineEdit {{
-                background: {INPUT_BG};
-                border: {bw} solid {border};
-                border-radius: 6px;
-                padding: 0 12px;
-                color: {TEXT_PRIMARY};
-                font-size: 13px;
-                selection-background-color: {ACCENT};
-            }}
-            QLineEdit::placeholder {{
-                color: {TEXT_HINT};
-            }}
-        """)
+        self.setProperty("focused", focused)
+        self.style().polish(self)
 
     def focusInEvent(self, e):
         self._apply_style(True)
@@ -143,50 +243,57 @@ class GoogleButton(QPushButton):
     Loads Glogo.png for the icon; falls back to a painted G if not found.
     """
 
+    _G_SIZE  = 24
+    _g_cache = None
+
     def __init__(self, logo_path: str = None, parent=None):
         super().__init__("Continue with Google", parent)
         self.setFixedHeight(42)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.setFont(QFont("Segoe UI Semibold", 10))
+        self.setFont(_font("Segoe UI Semibold", 10))
         self._logo_path  = logo_path
         self._use_pixmap = False
 
         if logo_path and os.path.exists(logo_path):
-            icon = QIcon(logo_path)
+            icon = QIcon(_pixmap(logo_path))
             self.setIcon(icon)
-            self.setIconSize(__import__('PyQt6.QtCore', fromlist=['QSize']).QSize(20, 20))
+            self.setIconSize(_GOOGLE_ICON_SIZE)
             self._use_pixmap = True
+        else:
+            self._build_g_cache()
 
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background: {GOOGLE_BG};
-                border: 1px solid {GOOGLE_BORDER};
-                border-radius: 6px;
-                color: {TEXT_PRIMARY};
-                font-size: 13px;
-                font-weight: 600;
-                padding-left: 8px;
-                text-align: center;
-            }}
-            QPushButton:hover   {{ background: {GOOGLE_HOVER}; border-color: {BORDER_STRONG}; }}
-            QPushButton:pressed {{ background: #E8E7E3; }}
-            QPushButton:disabled {{ color: {TEXT_HINT}; }}
-        """)
+        self.setObjectName("google")
 
     def paintEvent(self, event):
         super().paintEvent(event)
                                                                 
         if not self._use_pixmap:
             p = QPainter(self)
-            p.setRenderHint(QPainter.RenderHint.Antialiasing)
-            icon_cx = 28
-            _paint_google_g(p, icon_cx, self.height() // 2, r=9)
+            half = GoogleButton._G_SIZE // 2
+            p.drawPixmap(28 - half, self.height() // 2 - half, GoogleButton._g_cache)
             p.end()
 
+    @classmethod
+    def _build_g_cache(cls):
+        """Rasterize the fallback G once; every repaint is then a single blit."""
+        if cls._g_cache is not None:
+            return
+        dpr = QApplication.instance().devicePixelRatio()
+        size = cls._G_SIZE
+        pm = QPixmap(int(size * dpr), int(size * dpr))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.GlobalColor.transparent)
+        p = QPainter(pm)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        _paint_google_g(p, size // 2, size // 2, r=9)
+        p.end()
+        cls._g_cache = pm
+
 class DividerLabel(QWidget):
     def __init__(self, text="or", parent=None):
         super().__init__(parent)
-        self._text = text
+        self._text   = text
+        self._padded = f"  {text}  "
         self.setFixedHeight(18)
 
     def paintEvent(self, event):
@@ -195,10 +302,10 @@ class DividerLabel(QWidget):
         w, h = self.width(), self.height()
         mid = h // 2
 
-        f = QFont("Segoe UI", 8)
+        f = _font("Segoe UI", 8)
         p.setFont(f)
         fm = p.fontMetrics()
-        tw = fm.horizontalAdvance(f"  {self._text}  ")
+        tw = fm.horizontalAdvance(self._padded)
         lx = (w - tw) // 2
 
         pen = QPen(QColor(DIVIDER))
@@ -211,31 +318,82 @@ class DividerLabel(QWidget):
         p.drawText(QRect(lx, 0, tw, h), Qt.AlignmentFlag.AlignCenter, self._text)
         p.end()
 
+def _pixmap(path: str) -> QPixmap:
+    """Decode an image file once and keep it in Qt's shared QPixmapCache."""
+    pm = QPixmapCache.find(path)
+    if pm is None or pm.isNull():
+        pm = QPixmap(path)
+        if not pm.isNull():
+            QPixmapCache.insert(path, pm)
+    return pm
+
+@lru_cache(maxsize=None)
+def _resolve_asset(filename: str):
+    """Locate an asset once per process; later dialog opens skip the stat() walk."""
+    base = os.path.dirname(os.path.abspath(__file__))
+    candidates = [
+        os.path.join(base, "..", "graphic", filename),
+        os.path.join(base, "..", "..", "graphic", filename),
+        os.path.join(base, "..", filename),
+        os.path.join(base, filename),
+        os.path.join(os.getcwd(), filename),
+    ]
+    for path in candidates:
+        if os.path.exists(path):
+            return os.path.abspath(path)
+    return None
+
 def _field_label(text: str) -> QLabel:
     lbl = QLabel(text)
-    lbl.setFont(QFont("Segoe UI Semibold", 8))
-    lbl.setStyleSheet(f"color: {TEXT_SECONDARY};")
+    lbl.setFont(_font("Segoe UI Semibold", 8))
+    lbl.setObjectName("secondaryText")
     return lbl
 
+_ROOT_SPACING = 14
+
+def _field_group(label, field: QWidget) -> QVBoxLayout:
+    """Label stacked 5px above its input, added to the root as one item."""
+    if isinstance(label, str):
+        label = _field_label(label)
+    grp = QVBoxLayout()
+    grp.setSpacing(5)
+    grp.addWidget(label)
+    grp.addWidget(field)
+    return grp
+
+def _add_gap(layout: QVBoxLayout, target: int):
+    """Widen the gap before the next item from _ROOT_SPACING to `target` px."""
+    # Spacer items count as empty, so the layout adds its spacing only once.
+    layout.addItem(QSpacerItem(0, target - _ROOT_SPACING,
+                               QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed))
+
 class LoginDialog(QDialog):
     """
     Redesigned OpenCivil login dialog.
     Quiet-confidence aesthetic — all auth logic preserved.
     """
 
+    # Logo pixmap/icon are decoded and scaled once, then shared by every instance.
+    _logo_cache = None
+    _icon_cache = None
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.user_info    = None
         self.remember_me  = False
-        self._auth_thread = None
-        self._mode        = "login"
+        self._auth_thread  = None
+        self._email_thread = None
+        self._mode         = "login"
 
         self.setWindowTitle("OpenCivil")
         self.setFixedSize(420, 570)
 
-        icon_path = self._find_asset_static("logo.png") or self._find_asset_static("logo.ico")
-        if icon_path:
-            self.setWindowIcon(QIcon(icon_path))
+        if LoginDialog._icon_cache is None:
+            icon_path = self._find_asset_static("logo.png") or self._find_asset_static("logo.ico")
+            if icon_path:
+                LoginDialog._icon_cache = QIcon(_pixmap(icon_path))
+        if LoginDialog._icon_cache is not None:
+            self.setWindowIcon(LoginDialog._icon_cache)
 
         self.setWindowFlags(
             Qt.WindowType.Dialog |
@@ -243,193 +401,169 @@ class LoginDialog(QDialog):
             Qt.WindowType.MSWindowsFixedSizeDialogHint
         )
         self.setModal(True)
+        self.setStyleSheet(_STYLESHEET)
 
-        self._noise = _make_noise_pixmap(420, 700)
+        self._noise = _noise_brush()
         self._build_ui()
 
     def paintEvent(self, event):
         p = QPainter(self)
         p.fillRect(self.rect(), QColor(BG))
-        p.drawPixmap(0, 0, self._noise)
+        p.fillRect(self.rect(), self._noise)
         p.end()
 
     def _build_ui(self):
         root = QVBoxLayout(self)
+        self._root = root
+        self._register_widgets_built = False
         root.setContentsMargins(40, 36, 40, 36)
-        root.setSpacing(0)
+        root.setSpacing(_ROOT_SPACING)
 
         logo_row = QHBoxLayout()
         logo_row.setSpacing(8)
         logo_row.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
 
         logo_lbl = QLabel()
-        logo_path = self._find_asset("logo.png") or self._find_asset("logo.ico")
-        if logo_path:
-            px = QPixmap(logo_path).scaled(
-                22, 22,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-            logo_lbl.setPixmap(px)
+        if LoginDialog._logo_cache is None:
+            logo_path = self._find_asset("logo.png") or self._find_asset("logo.ico")
+            if logo_path:
+                LoginDialog._logo_cache = _pixmap(logo_path).scaled(
+                    22, 22,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+        if LoginDialog._logo_cache is not None:
+            logo_lbl.setPixmap(LoginDialog._logo_cache)
         else:
             logo_lbl.setText("◈")
-            logo_lbl.setStyleSheet(f"color: {ACCENT}; font-size: 18px;")
+            logo_lbl.setObjectName("logoGlyph")
 
         app_name = QLabel("OpenCivil")
-        app_name.setFont(QFont("Segoe UI Semibold", 12))
-        app_name.setStyleSheet(f"color: {TEXT_PRIMARY};")
+        app_name.setFont(_font("Segoe UI Semibold", 12))
+        app_name.setObjectName("primaryText")
 
         logo_row.addWidget(logo_lbl)
         logo_row.addWidget(app_name)
         root.addLayout(logo_row)
-        root.addSpacing(40)
+        _add_gap(root, 40)
 
+        header = QVBoxLayout()
+        header.setSpacing(4)
         self.lbl_heading = QLabel("Welcome back.")
-        self.lbl_heading.setFont(QFont("Segoe UI Semibold", 22))
-        self.lbl_heading.setStyleSheet(f"color: {TEXT_PRIMARY};")
-        root.addWidget(self.lbl_heading)
-        root.addSpacing(4)
+        self.lbl_heading.setFont(_font("Segoe UI Semibold", 22))
+        self.lbl_heading.setObjectName("primaryText")
+        header.addWidget(self.lbl_heading)
 
         self.tagline = QLabel("Sign in to your account")
-        self.tagline.setFont(QFont("Segoe UI", 11))
-        self.tagline.setStyleSheet(f"color: {TEXT_SECONDARY};")
-        root.addWidget(self.tagline)
-        root.addSpacing(30)
+        self.tagline.setFont(_font("Segoe UI", 11))
+        self.tagline.setObjectName("secondaryText")
+        header.addWidget(self.tagline)
+        root.addLayout(header)
+        _add_gap(root, 30)
 
-        root.addWidget(_field_label("Email"))
-        root.addSpacing(5)
         self.input_email = StyledInput("you@example.com")
-        root.addWidget(self.input_email)
-        root.addSpacing(14)
+        root.addLayout(_field_group("Email", self.input_email))
 
-        self.name_lbl = _field_label("Full Name")
-        self.name_lbl.setVisible(False)
-        root.addWidget(self.name_lbl)
-        root.addSpacing(5)
-        self.input_name = StyledInput("Your full name")
-        self.input_name.setVisible(False)
-        root.addWidget(self.input_name)
-        root.addSpacing(14)
+        # Register-only fields are built on first switch to register mode;
+        # only their positions in the layout are remembered here.
+        self._name_slot = root.count()
 
-        root.addWidget(_field_label("Password"))
-        root.addSpacing(5)
         self.input_password = StyledInput("••••••••", password=True)
-        root.addWidget(self.input_password)
-        root.addSpacing(14)
+        root.addLayout(_field_group("Password", self.input_password))
 
-        self.confirm_lbl = _field_label("Confirm Password")
-        self.confirm_lbl.setVisible(False)
-        root.addWidget(self.confirm_lbl)
-        root.addSpacing(5)
-        self.input_confirm = StyledInput("••••••••", password=True)
-        self.input_confirm.setVisible(False)
-        root.addWidget(self.input_confirm)
-        root.addSpacing(14)
+        self._confirm_slot = root.count()
 
         row_rf = QHBoxLayout()
         self.chk_remember = QCheckBox("Remember me")
-        self.chk_remember.setFont(QFont("Segoe UI", 9))
-        self.chk_remember.setStyleSheet(f"""
-            QCheckBox {{
-                color: {TEXT_SECONDARY};
-                spacing: 6px;
-            }}
-            QCheckBox::indicator {{
-                width: 14px; height: 14px;
-                border: 1px solid {INPUT_BORDER};
-                border-radius: 3px;
-                background: {INPUT_BG};
-            }}
-            QCheckBox::indicator:checked {{
-                background: {ACCENT};
-                border-color: {ACCENT};
-            }}
-        """)
+        self.chk_remember.setFont(_font("Segoe UI", 9))
         row_rf.addWidget(self.chk_remember)
         row_rf.addStretch()
 
-        self.lbl_forgot = QLabel(
-            f'<a href="#" style="color:{TEXT_SECONDARY};text-decoration:none;">'
-            f'Forgot password?</a>'
-        )
-        self.lbl_forgot.setFont(QFont("Segoe UI", 9))
+        self.lbl_forgot = QLabel(_FORGOT_LINK_HTML)
+        self.lbl_forgot.setFont(_font("Segoe UI", 9))
         self.lbl_forgot.setOpenExternalLinks(False)
         self.lbl_forgot.linkActivated.connect(lambda _: self._on_forgot_password())
         row_rf.addWidget(self.lbl_forgot)
         root.addLayout(row_rf)
-        root.addSpacing(20)
+        _add_gap(root, 20)
 
         self.btn_primary = QPushButton("Sign In")
         self.btn_primary.setFixedHeight(42)
         self.btn_primary.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.btn_primary.setFont(QFont("Segoe UI Semibold", 10))
-        self.btn_primary.setStyleSheet(f"""
-            QPushButton {{
-                background: {ACCENT};
-                border: none;
-                border-radius: 6px;
-                color: {ACCENT_TEXT};
-                font-size: 13px;
-                font-weight: 600;
-            }}
-            QPushButton:hover   {{ background: {ACCENT_HOVER}; }}
-            QPushButton:pressed {{ background: {ACCENT_PRESSED}; }}
-            QPushButton:disabled {{
-                background: {INPUT_BORDER};
-                color: {TEXT_HINT};
-            }}
-        """)
+        self.btn_primary.setFont(_font("Segoe UI Semibold", 10))
+        self.btn_primary.setObjectName("primary")
         self.btn_primary.clicked.connect(self._on_primary)
         root.addWidget(self.btn_primary)
-        root.addSpacing(20)
+        _add_gap(root, 20)
 
         self.lbl_status = QLabel("")
         self.lbl_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_status.setFont(QFont("Segoe UI", 8))
-        self.lbl_status.setStyleSheet(f"color: {TEXT_HINT};")
+        self.lbl_status.setFont(_font("Segoe UI", 8))
+        self.lbl_status.setObjectName("status")
+        self.lbl_status.setProperty("error", False)
         self.lbl_status.setWordWrap(True)
         self.lbl_status.setFixedHeight(16)
         root.addWidget(self.lbl_status)
-        root.addSpacing(18)
+        _add_gap(root, 18)
 
         root.addWidget(DividerLabel("or"))
-        root.addSpacing(14)
 
         glogo_path = self._find_asset("Glogo.png")
         self.btn_google = GoogleButton(logo_path=glogo_path)
         self.btn_google.clicked.connect(self._on_google_login)
         root.addWidget(self.btn_google)
 
-        root.addSpacing(24)
+        _add_gap(root, 24)
         root.addStretch()
 
         toggle_row = QHBoxLayout()
         toggle_row.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.lbl_toggle_hint = QLabel("Don't have an account?")
-        self.lbl_toggle_hint.setFont(QFont("Segoe UI", 9))
-        self.lbl_toggle_hint.setStyleSheet(f"color: {TEXT_SECONDARY};")
+        self.lbl_toggle_hint.setFont(_font("Segoe UI", 9))
+        self.lbl_toggle_hint.setObjectName("secondaryText")
         toggle_row.addWidget(self.lbl_toggle_hint)
 
         self.btn_toggle = QPushButton("Create one")
         self.btn_toggle.setFlat(True)
         self.btn_toggle.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.btn_toggle.setFont(QFont("Segoe UI Semibold", 9))
-        self.btn_toggle.setStyleSheet(f"""
-            QPushButton {{
-                color: {ACCENT};
-                border: none;
-                background: transparent;
-                padding: 0;
-                margin-left: 4px;
-            }}
-            QPushButton:hover {{ color: {ACCENT_HOVER}; }}
-        """)
+        self.btn_toggle.setFont(_font("Segoe UI Semibold", 9))
+        self.btn_toggle.setObjectName("toggle")
         self.btn_toggle.clicked.connect(self._toggle_mode)
         toggle_row.addWidget(self.btn_toggle)
         root.addLayout(toggle_row)
 
+    def _build_register_widgets(self):
+        if self._register_widgets_built:
+            return
+        root = self._root
+        # Insert the later slot first so the earlier slot's index stays valid.
+        self.confirm_lbl   = _field_label("Confirm Password")
+        self.input_confirm = StyledInput("••••••••", password=True)
+        root.insertLayout(self._confirm_slot,
+                          _field_group(self.confirm_lbl, self.input_confirm))
+
+        self.name_lbl   = _field_label("Full Name")
+        self.input_name = StyledInput("Your full name")
+        root.insertLayout(self._name_slot,
+                          _field_group(self.name_lbl, self.input_name))
+
+        QWidget.setTabOrder(self.input_email, self.input_name)
+        QWidget.setTabOrder(self.input_name, self.input_password)
+        QWidget.setTabOrder(self.input_password, self.input_confirm)
+        self._register_widgets_built = True
+
     def _toggle_mode(self):
+        # Apply every text/visibility change with painting off, then relayout once.
+        self.setUpdatesEnabled(False)
+        try:
+            self._apply_mode_toggle()
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+
+    def _apply_mode_toggle(self):
         if self._mode == "login":
+            self._build_register_widgets()
             self._mode = "register"
             self.lbl_heading.setText("Create account.")
             self.tagline.setText("Join OpenCivil today")
@@ -482,47 +616,59 @@ class LoginDialog(QDialog):
                 return
 
             self._set_status("Creating your account…", error=False)
-            QApplication.processEvents()
+            self._run_email_op(
+                "register", name, email, password,
+                on_done=lambda ok, err, _: self._on_register_result(ok, err, email, name),
+            )
 
-            ok, err, _ = email_auth.register(name, email, password)
-            if not ok:
-                self._set_status(err, error=True)
-                self._reset_buttons()
-                return
+        else:
+            self._set_status("Signing in…", error=False)
+            self._run_email_op(
+                "login", email, password,
+                on_done=lambda ok, err, info: self._on_login_result(ok, err, info, email),
+            )
 
-            self._set_status("", error=False)
+    def _run_email_op(self, op, *args, on_done):
+        """Run an email_auth call on EmailAuthThread and hand its result to on_done."""
+        self._email_thread = EmailAuthThread(op, *args, parent=self)
+        self._email_thread.finished_result.connect(on_done)
+        self._email_thread.start()
+
+    def _on_register_result(self, ok, err, email, name):
+        if not ok:
+            self._set_status(err, error=True)
             self._reset_buttons()
-            self._show_verify_dialog(email, name)
+            return
 
-        else:
-            self._set_status("Signing in…", error=False)
-            QApplication.processEvents()
-
-            ok, err, user_info = email_auth.login(email, password)
-            if not ok:
-                if "verify your email" in err:
-                    self._set_status("Sending new verification code...", error=False)
-                    QApplication.processEvents()
-                    
-                    from . import email_service
-                    from .db import set_verify_code
-                    fresh_code = email_service.generate_code(6)
-                    set_verify_code(email, fresh_code)
-                    
-                    email_service.send_verification_email(email, "User", fresh_code)
-                    
-                    self._set_status("", error=False)
-                    self._reset_buttons()
-                    self._show_verify_dialog(email, "User")
-                    return
-                self._set_status(err, error=True)
-                self._reset_buttons()
+        self._set_status("", error=False)
+        self._reset_buttons()
+        self._show_verify_dialog(email, name)
+
+    def _on_login_result(self, ok, err, user_info, email):
+        if not ok:
+            if "verify your email" in err:
+                self._set_status("Sending new verification code...", error=False)
+                self._run_email_op(
+                    "resend_verify", email, "User",
+                    on_done=lambda ok2, err2, _: self._on_resend_result(ok2, err2, email),
+                )
                 return
+            self._set_status(err, error=True)
+            self._reset_buttons()
+            return
 
-            self.user_info   = user_info
-            self.remember_me = self.chk_remember.isChecked()
-            self._set_status(f"Welcome back, {user_info['name'].split()[0]}!", error=False)
-            QTimer.singleShot(600, self.accept)
+        self.user_info   = user_info
+        self.remember_me = self.chk_remember.isChecked()
+        self._set_status(f"Welcome back, {user_info['name'].split()[0]}!", error=False)
+        QTimer.singleShot(600, self.accept)
+
+    def _on_resend_result(self, ok, err, email):
+        self._reset_buttons()
+        if not ok:
+            self._set_status(err, error=True)
+            return
+        self._set_status("", error=False)
+        self._show_verify_dialog(email, "User")
 
     def _reset_buttons(self):
         self.btn_primary.setEnabled(True)
@@ -535,9 +681,15 @@ class LoginDialog(QDialog):
             return
 
         self._set_status("Sending reset code…", error=False)
-        QApplication.processEvents()
+        self.btn_primary.setEnabled(False)
+        self.btn_google.setEnabled(False)
+        self._run_email_op(
+            "forgot", email,
+            on_done=lambda ok, err, _: self._on_forgot_result(ok, err, email),
+        )
 
-        ok, err, _ = email_auth.send_forgot_password(email)
+    def _on_forgot_result(self, ok, err, email):
+        self._reset_buttons()
         if not ok:
             self._set_status(err, error=True)
             return
@@ -555,19 +707,33 @@ class LoginDialog(QDialog):
         if dlg.exec() != QDialog.DialogCode.Accepted:
             return
 
-        code = dlg.get_code()
-        ok, err, _ = email_auth.confirm_verification(email, code)
+        self._set_status("Verifying…", error=False)
+        self.btn_primary.setEnabled(False)
+        self.btn_google.setEnabled(False)
+        self._run_email_op(
+            "verify", email, dlg.get_code(),
+            on_done=lambda ok, err, _: self._on_verify_result(ok, err, email, name),
+        )
+
+    def _on_verify_result(self, ok, err, email, name):
         if not ok:
             self._set_status(err, error=True)
+            self._reset_buttons()
             return
 
-        ok2, err2, user_info = email_auth.login(email, self.input_password.text())
-        if ok2:
+        self._run_email_op(
+            "login", email, self.input_password.text(),
+            on_done=lambda ok2, _err, info: self._on_verified_login(ok2, info, name),
+        )
+
+    def _on_verified_login(self, ok, user_info, name):
+        if ok:
             self.user_info   = user_info
             self.remember_me = self.chk_remember.isChecked()
             self._set_status(f"Welcome, {name.split()[0]}! Account verified ✓", error=False)
             QTimer.singleShot(800, self.accept)
         else:
+            self._reset_buttons()
             self._set_status("Verified! Please sign in.", error=False)
             self._toggle_mode()
 
@@ -602,24 +768,14 @@ class LoginDialog(QDialog):
         self._set_status(message, error=True)
 
     def _set_status(self, text: str, error: bool = False):
-        color = ERROR_COLOR if error else TEXT_SECONDARY
-        self.lbl_status.setStyleSheet(f"color: {color}; font-size: 11px;")
+        if self.lbl_status.property("error") != error:
+            self.lbl_status.setProperty("error", error)
+            self.lbl_status.style().polish(self.lbl_status)
         self.lbl_status.setText(text)
 
     @staticmethod
     def _find_asset_static(filename: str):
-        base = os.path.dirname(os.path.abspath(__file__))
-        candidates = [
-            os.path.join(base, "..", "graphic", filename),
-            os.path.join(base, "..", "..", "graphic", filename),
-            os.path.join(base, "..", filename),
-            os.path.join(base, filename),
-            os.path.join(os.getcwd(), filename),
-        ]
-        for path in candidates:
-            if os.path.exists(path):
-                return os.path.abspath(path)
-        return None
+        return _resolve_asset(filename)
 
     def _find_asset(self, filename: str):
         return self._find_asset_static(filename)
@@ -637,13 +793,14 @@ class CodeInputDialog(QDialog):
             Qt.WindowType.WindowCloseButtonHint
         )
         self.setModal(True)
-        self._noise = _make_noise_pixmap(360, 260)
+        self.setStyleSheet(_STYLESHEET)
+        self._noise = _noise_brush()
         self._build(title, subtitle, btn_label)
 
     def paintEvent(self, event):
         p = QPainter(self)
         p.fillRect(self.rect(), QColor(BG))
-        p.drawPixmap(0, 0, self._noise)
+        p.fillRect(self.rect(), self._noise)
         p.end()
 
     def _build(self, title, subtitle, btn_label):
@@ -652,14 +809,14 @@ class CodeInputDialog(QDialog):
         lay.setSpacing(0)
 
         lbl_title = QLabel(title)
-        lbl_title.setFont(QFont("Segoe UI Semibold", 13))
-        lbl_title.setStyleSheet(f"color: {TEXT_PRIMARY};")
+        lbl_title.setFont(_font("Segoe UI Semibold", 13))
+        lbl_title.setObjectName("primaryText")
         lay.addWidget(lbl_title)
         lay.addSpacing(6)
 
         lbl_sub = QLabel(subtitle)
-        lbl_sub.setFont(QFont("Segoe UI", 9))
-        lbl_sub.setStyleSheet(f"color: {TEXT_SECONDARY};")
+        lbl_sub.setFont(_font("Segoe UI", 9))
+        lbl_sub.setObjectName("secondaryText")
         lbl_sub.setWordWrap(True)
         lay.addWidget(lbl_sub)
         lay.addSpacing(20)
@@ -667,14 +824,14 @@ class CodeInputDialog(QDialog):
         self.input_code = StyledInput("Enter 6-digit code")
         self.input_code.setMaxLength(6)
         self.input_code.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.input_code.setFont(QFont("Segoe UI Semibold", 16))
+        self.input_code.setFont(_font("Segoe UI Semibold", 16))
         lay.addWidget(self.input_code)
         lay.addSpacing(6)
 
         self.lbl_err = QLabel("")
         self.lbl_err.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_err.setFont(QFont("Segoe UI", 9))
-        self.lbl_err.setStyleSheet(f"color: {ERROR_COLOR};")
+        self.lbl_err.setFont(_font("Segoe UI", 9))
+        self.lbl_err.setObjectName("errorText")
         self.lbl_err.setFixedHeight(14)
         lay.addWidget(self.lbl_err)
         lay.addSpacing(16)
@@ -682,16 +839,8 @@ class CodeInputDialog(QDialog):
         btn = QPushButton(btn_label)
         btn.setFixedHeight(42)
         btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn.setFont(QFont("Segoe UI Semibold", 10))
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background: {ACCENT};
-                border: none; border-radius: 6px;
-                color: white; font-size: 13px;
-            }}
-            QPushButton:hover   {{ background: {ACCENT_HOVER}; }}
-            QPushButton:pressed {{ background: {ACCENT_PRESSED}; }}
-        """)
+        btn.setFont(_font("Segoe UI Semibold", 10))
+        btn.setObjectName("primary")
         btn.clicked.connect(self._confirm)
         lay.addWidget(btn)
 
@@ -710,7 +859,8 @@ class ResetPasswordDialog(QDialog):
 
     def __init__(self, email: str, parent=None):
         super().__init__(parent)
-        self._email = email
+        self._email  = email
+        self._thread = None
         self.setWindowTitle("Reset Password")
         self.setFixedSize(360, 340)
         self.setWindowFlags(
@@ -718,13 +868,14 @@ class ResetPasswordDialog(QDialog):
             Qt.WindowType.WindowCloseButtonHint
         )
         self.setModal(True)
-        self._noise = _make_noise_pixmap(360, 340)
+        self.setStyleSheet(_STYLESHEET)
+        self._noise = _noise_brush()
         self._build()
 
     def paintEvent(self, event):
         p = QPainter(self)
         p.fillRect(self.rect(), QColor(BG))
-        p.drawPixmap(0, 0, self._noise)
+        p.fillRect(self.rect(), self._noise)
         p.end()
 
     def _build(self):
@@ -733,14 +884,14 @@ class ResetPasswordDialog(QDialog):
         lay.setSpacing(0)
 
         lbl_title = QLabel("Reset your password")
-        lbl_title.setFont(QFont("Segoe UI Semibold", 13))
-        lbl_title.setStyleSheet(f"color: {TEXT_PRIMARY};")
+        lbl_title.setFont(_font("Segoe UI Semibold", 13))
+        lbl_title.setObjectName("primaryText")
         lay.addWidget(lbl_title)
         lay.addSpacing(6)
 
         lbl_sub = QLabel(f"Enter the code sent to {self._email}\nand choose a new password.")
-        lbl_sub.setFont(QFont("Segoe UI", 9))
-        lbl_sub.setStyleSheet(f"color: {TEXT_SECONDARY};")
+        lbl_sub.setFont(_font("Segoe UI", 9))
+        lbl_sub.setObjectName("secondaryText")
         lbl_sub.setWordWrap(True)
         lay.addWidget(lbl_sub)
         lay.addSpacing(20)
@@ -760,27 +911,19 @@ class ResetPasswordDialog(QDialog):
 
         self.lbl_err = QLabel("")
         self.lbl_err.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_err.setFont(QFont("Segoe UI", 9))
-        self.lbl_err.setStyleSheet(f"color: {ERROR_COLOR};")
+        self.lbl_err.setFont(_font("Segoe UI", 9))
+        self.lbl_err.setObjectName("errorText")
         self.lbl_err.setFixedHeight(14)
         lay.addWidget(self.lbl_err)
         lay.addSpacing(16)
 
-        btn = QPushButton("Reset Password")
-        btn.setFixedHeight(42)
-        btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn.setFont(QFont("Segoe UI Semibold", 10))
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background: {ACCENT};
-                border: none; border-radius: 6px;
-                color: white; font-size: 13px;
-            }}
-            QPushButton:hover   {{ background: {ACCENT_HOVER}; }}
-            QPushButton:pressed {{ background: {ACCENT_PRESSED}; }}
-        """)
-        btn.clicked.connect(self._confirm)
-        lay.addWidget(btn)
+        self.btn_confirm = QPushButton("Reset Password")
+        self.btn_confirm.setFixedHeight(42)
+        self.btn_confirm.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_confirm.setFont(_font("Segoe UI Semibold", 10))
+        self.btn_confirm.setObjectName("primary")
+        self.btn_confirm.clicked.connect(self._confirm)
+        lay.addWidget(self.btn_confirm)
 
     def _confirm(self):
         code     = self.input_code.text().strip()
@@ -793,8 +936,14 @@ class ResetPasswordDialog(QDialog):
             self.lbl_err.setText("Password must be at least 8 characters.")
             return
 
-        QApplication.processEvents()
-        ok, err, _ = email_auth.confirm_reset(self._email, code, password)
+        self.lbl_err.setText("")
+        self.btn_confirm.setEnabled(False)
+        self._thread = EmailAuthThread("reset", self._email, code, password, parent=self)
+        self._thread.finished_result.connect(self._on_reset_result)
+        self._thread.start()
+
+    def _on_reset_result(self, ok, err, _):
+        self.btn_confirm.setEnabled(True)
         if not ok:
             self.lbl_err.setText(err)
             return
@@ -4,30 +4,81 @@ auth/email_auth.py
 Business logic for email/password authentication.
 Handles register, login, email verification, and password reset.
 All DB and email calls are wrapped so the dialog just calls simple methods.
+
+User lookups are cached in db.py (short TTL, misses included), and every
+db write helper invalidates its entry, so nothing here keeps its own cache.
 """
 
+import os
+import re
+import queue
 import logging
-from datetime import datetime, timezone, timedelta
+import functools
+import threading
+import time
+from concurrent.futures import wait
 from typing import Tuple, Optional, Dict, Any
 
 import bcrypt
-from pymongo.errors import DuplicateKeyError
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError, InvalidHashError
+except ImportError:
+    PasswordHasher = None
+from pymongo.errors import ConnectionFailure, DuplicateKeyError
 
 from .db import (
-    create_user, get_user_by_email,
+    create_user, delete_user, get_user_by_email,
     set_verify_code, verify_user,
-    set_reset_code, reset_password,
-    update_last_login, Database,
+    set_reset_code, reset_password, update_password_hash,
+    update_last_login, request_clock, Database,
+)
+from .email_service import (
+    generate_code, ensure_mail_config,
+    enqueue_verification_email, enqueue_reset_email,
 )
-from .email_service import generate_code, send_verification_email, send_reset_email
 
 logger = logging.getLogger(__name__)
 
-def _hash(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+# bcrypt work factor for new hashes. 10 keeps an interactive login well
+# under half a second; existing hashes carry their own cost and still verify.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+RESET_CODE_TTL = 15 * 60    # seconds
+# How long register() waits for the verification email before answering.
+REGISTER_MAIL_WAIT = 10.0   # seconds
 
-def _check(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+# New hashes are Argon2id (OWASP baseline: 46 MiB, t=1, p=1) when argon2-cffi
+# is installed; bcrypt hashes still verify and are upgraded on next login.
+_ph = (PasswordHasher(time_cost=1, memory_cost=46 * 1024, parallelism=1)
+       if PasswordHasher is not None else None)
+
+def _hash(password: str) -> str:
+    if _ph is not None:
+        return _ph.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+def _check(password: str, hashed: str) -> Tuple[bool, bool]:
+    """Returns (ok, needs_rehash)."""
+    if hashed.startswith("$argon2"):
+        if _ph is None:
+            logger.error("Argon2 hash found but argon2-cffi is not installed")
+            return False, False
+        try:
+            _ph.verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False, False
+        return True, _ph.check_needs_rehash(hashed)
+    ok = bcrypt.checkpw(password.encode(), hashed.encode())
+    return ok, ok and _ph is not None
+
+@functools.cache
+def _dummy_hash() -> str:
+    """
+    Checked against when the account doesn't exist (see login()). Built with
+    _hash(), so it uses the same scheme and cost as the hashes logins
+    upgrade accounts to, and only on first use.
+    """
+    return _hash("opencivil-dummy-password")
 
 def _ok(data: Any = None)  -> Tuple[bool, str, Any]:
     return True,  "",      data
@@ -35,21 +86,77 @@ def _ok(data: Any = None)  -> Tuple[bool, str, Any]:
 def _err(msg: str)         -> Tuple[bool, str, None]:
     return False, msg,     None
 
+# One message for unknown email and wrong password, matching the equal timing.
+_BAD_CREDENTIALS = "Incorrect email or password."
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+def _validate_email(email: str) -> Optional[str]:
+    if not _EMAIL_RE.match(email.strip()):
+        return "Please enter a valid email address."
+    return None
+
+def _validate_register_input(email: str, password: str) -> Optional[str]:
+    """Return an error message for bad input, or None. Runs before any DB/bcrypt work."""
+    if len(password) < 8:
+        return "Password must be at least 8 characters."
+    return _validate_email(email)
+
+_db_ready = False
+_db_lock  = threading.Lock()
+
+def _ensure_db() -> bool:
+    """Create the shared client once; later calls are a flag check."""
+    global _db_ready
+    if _db_ready:
+        return True
+    with _db_lock:
+        if not _db_ready:
+            try:
+                Database.connect()
+            except Exception as exc:
+                logger.error("Database.connect failed: %s", exc)
+                return False
+            _db_ready = True
+    return True
+
+def _offline_guard(fn):
+    """
+    The client connects lazily, so an unreachable server surfaces on the first
+    query. Each call also runs under one request_clock(), so all of its writes
+    share a timestamp.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            with request_clock():
+                return fn(*args, **kwargs)
+        except ConnectionFailure as exc:
+            logger.error("Database unreachable in %s: %s", fn.__name__, exc)
+            return _err("Cannot connect to database. Check your internet connection.")
+    return wrapper
+
+def _drop_if_unsent(email, sent):
+    """Done-callback for a verification email register() stopped waiting on."""
+    if sent.exception() is None:
+        return
+    try:
+        delete_user(email, unverified_only=True)
+    except Exception as exc:
+        logger.error("Could not remove unverifiable account %s: %s", email, exc)
+
+@_offline_guard
 def register(name: str, email: str,
              password: str) -> Tuple[bool, str, None]:
     """
     Create a new account and send a verification email.
     Returns (success, error_message, None).
     """
-                      
-    if len(password) < 8:
-        return _err("Password must be at least 8 characters.")
-    if "@" not in email:
-        return _err("Please enter a valid email address.")
+    problem = _validate_register_input(email, password)
+    if problem:
+        return _err(problem)
 
-    try:
-        Database.connect()
-    except Exception:
+    if not _ensure_db():
         return _err("Cannot connect to database. Check your internet connection.")
 
     existing = get_user_by_email(email)
@@ -59,12 +166,26 @@ def register(name: str, email: str,
         return _err("An account with this email already exists.")
 
     try:
+        ensure_mail_config()
         pw_hash = _hash(password)
-        create_user(name, email, pw_hash, provider="email")
-
-        code = generate_code(6)
-        set_verify_code(email, code)
-        send_verification_email(email, name, code)
+        code    = generate_code(6)
+        # The code goes in with the insert, so registration is one write.
+        create_user(name, email, pw_hash, provider="email", verify_code=code)
+
+        # Don't leave an account the user can't verify or re-register.
+        try:
+            sent = enqueue_verification_email(email, name, code)
+        except queue.Full:
+            delete_user(email)
+            return _err("Failed to send email. Please try again.")
+
+        done, _ = wait([sent], timeout=REGISTER_MAIL_WAIT)
+        if not done:
+            # Still retrying; drop the account if the worker gives up.
+            sent.add_done_callback(functools.partial(_drop_if_unsent, email))
+        elif sent.exception() is not None:
+            delete_user(email, unverified_only=True)
+            return _err("Failed to send email. Please try again.")
 
         logger.info("Registered new user: %s", email)
         return _ok()
@@ -75,29 +196,42 @@ def register(name: str, email: str,
         logger.error("Registration error: %s", exc)
         return _err(f"Registration failed: {exc}")
 
+@_offline_guard
 def login(email: str, password: str) -> Tuple[bool, str, Optional[Dict]]:
     """
     Verify credentials and return user info dict on success.
     Returns (success, error_message, user_info_or_None).
     """
-    try:
-        Database.connect()
-    except Exception:
+    if not _ensure_db():
         return _err("Cannot connect to database. Check your internet connection.")
 
     user = get_user_by_email(email)
+
+    # Always pay for exactly one bcrypt check so response time doesn't
+    # reveal whether the account exists.
+    stored = (user or {}).get("password_hash") or _dummy_hash()
+    ok, needs_rehash = _check(password, stored)
+
     if not user:
-        return _err("No account found with this email.")
+        return _err(_BAD_CREDENTIALS)
 
     if user.get("provider") == "google":
         return _err("This email is linked to a Google account. Use Google login.")
 
-    if not _check(password, user.get("password_hash", "")):
-        return _err("Incorrect password.")
+    if not ok:
+        return _err(_BAD_CREDENTIALS)
 
     if not user.get("verified"):
         return _err("Please verify your email first. Check your inbox.")
 
+    if needs_rehash:
+        try:
+            update_password_hash(email, stored, _hash(password))
+        except Exception as exc:
+            logger.warning("Could not upgrade password hash for %s: %s", email, exc)
+
+    # Touch only after a verified, successful check. This is a queued,
+    # batched write, so the read above is the only blocking round-trip.
     update_last_login(email)
 
     user_info = {
@@ -108,61 +242,83 @@ def login(email: str, password: str) -> Tuple[bool, str, Optional[Dict]]:
     }
     return _ok(user_info)
 
+@_offline_guard
+def resend_verification(email: str,
+                        name: str = "User") -> Tuple[bool, str, None]:
+    """Issue a fresh verification code for an unverified account."""
+    if not _ensure_db():
+        return _err("Cannot connect to database.")
+
+    code = generate_code(6)
+    user = set_verify_code(email, code)
+    if user is None:
+        # Unknown, already verified, or a Google account: nothing to verify.
+        return _err("Could not send a verification code to this email.")
+
+    try:
+        enqueue_verification_email(email, user.get("name") or name, code)
+    except queue.Full:
+        return _err("Failed to send email. Please try again.")
+    return _ok()
+
+@_offline_guard
 def confirm_verification(email: str,
                          code: str) -> Tuple[bool, str, None]:
     """Check the 6-digit code and mark account as verified."""
-    try:
-        Database.connect()
-    except Exception:
+    if not _ensure_db():
         return _err("Cannot connect to database.")
 
-    success = verify_user(email, code)
-    if not success:
+    user = verify_user(email, code)
+    if user is None:
         return _err("Invalid or expired code. Please try again.")
 
     logger.info("Email verified: %s", email)
     return _ok()
 
+@_offline_guard
 def send_forgot_password(email: str) -> Tuple[bool, str, None]:
     """Generate a reset code and email it to the user."""
-    try:
-        Database.connect()
-    except Exception:
+    problem = _validate_email(email)
+    if problem:
+        return _err(problem)
+
+    if not _ensure_db():
         return _err("Cannot connect to database.")
 
+    # Same reply either way, so unknown addresses can't be enumerated.
+    # Repeat probes for one address hit the lookup's negative cache.
     user = get_user_by_email(email)
     if not user:
-                                                                
         return _ok()
 
     if user.get("provider") == "google":
         return _err("This account uses Google login. No password to reset.")
 
     code    = generate_code(6)
-    expires = datetime.now(timezone.utc) + timedelta(minutes=15)
+    expires = int(time.time()) + RESET_CODE_TTL
     set_reset_code(email, code, expires)
 
     try:
-        send_reset_email(email, user.get("name", ""), code)
-    except Exception as exc:
-        logger.error("Failed to send reset email: %s", exc)
+        enqueue_reset_email(email, user.get("name", ""), code)
+    except queue.Full:
+        logger.error("Mail queue full; reset email to %s not sent", email)
         return _err("Failed to send email. Please try again.")
 
     return _ok()
 
+@_offline_guard
 def confirm_reset(email: str, code: str,
                   new_password: str) -> Tuple[bool, str, None]:
     """Verify the reset code and set the new password."""
-    if len(new_password) < 8:
-        return _err("Password must be at least 8 characters.")
+    problem = _validate_register_input(email, new_password)
+    if problem:
+        return _err(problem)
 
-    try:
-        Database.connect()
-    except Exception:
+    if not _ensure_db():
         return _err("Cannot connect to database.")
 
-    success = reset_password(email, code, _hash(new_password))
-    if not success:
+    user = reset_password(email, code, _hash(new_password))
+    if user is None:
         return _err("Invalid or expired reset code. Please request a new one.")
 
     logger.info("Password reset successful: %s", email)
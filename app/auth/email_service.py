@@ -1,19 +1,22 @@
 import os
+import time
+import queue
+import atexit
 import smtplib
 import logging
-import random
-import string
-from pathlib import Path
+import threading
+import secrets
+from concurrent.futures import Future
+from functools import lru_cache
+from html import escape
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from dotenv import load_dotenv
-
-_root = Path(__file__).resolve().parent.parent.parent
-load_dotenv(_root / ".env")
 
 logger      = logging.getLogger(__name__)
 SENDER_NAME = "OpenCivil"
 
+# A failed lookup raises and so isn't cached; it is retried on the next send.
+@lru_cache(maxsize=1)
 def _creds():
     addr = os.getenv("GMAIL_ADDRESS", "")
     pwd  = os.getenv("GMAIL_APP_PASS", "")
@@ -21,6 +24,66 @@ def _creds():
         raise ValueError("GMAIL_ADDRESS / GMAIL_APP_PASS not set in .env")
     return addr, pwd
 
+def ensure_mail_config():
+    """Raise ValueError now, rather than on the mail worker, if sending can't work."""
+    _creds()
+
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
+
+class _SMTPPool:
+    """
+    One logged-in SMTP_SSL session reused across sends, so each email
+    doesn't pay for a new TLS handshake and AUTH. The session is checked
+    with NOOP before use and rebuilt if the server dropped it.
+    """
+
+    def __init__(self):
+        self._server = None
+        self._lock   = threading.Lock()
+
+    def sendmail(self, addr, pwd, to_email, message):
+        with self._lock:
+            try:
+                server = self._session(addr, pwd)
+                server.sendmail(addr, to_email, message)
+            except smtplib.SMTPServerDisconnected:
+                self._drop()
+                server = self._session(addr, pwd)
+                server.sendmail(addr, to_email, message)
+
+    def close(self):
+        with self._lock:
+            if self._server is not None:
+                try:
+                    self._server.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self._server = None
+
+    def _session(self, addr, pwd):
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop()
+        server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT)
+        server.login(addr, pwd)
+        self._server = server
+        return server
+
+    def _drop(self):
+        try:
+            if self._server is not None:
+                self._server.close()
+        finally:
+            self._server = None
+
+_smtp = _SMTPPool()
+atexit.register(_smtp.close)
+
 def _send(to_email: str, subject: str, html_body: str):
     addr, pwd = _creds()
     msg = MIMEMultipart("alternative")
@@ -28,16 +91,15 @@ def _send(to_email: str, subject: str, html_body: str):
     msg["From"]    = f"{SENDER_NAME} <{addr}>"
     msg["To"]      = to_email
     msg.attach(MIMEText(html_body, "html"))
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-        server.login(addr, pwd)
-        server.sendmail(addr, to_email, msg.as_string())
+    _smtp.sendmail(addr, pwd, to_email, msg.as_string())
     logger.info("Email sent to %s | %s", to_email, subject)
 
+_POW10 = [10 ** i for i in range(13)]
+
 def generate_code(length: int = 6) -> str:
-    return "".join(random.choices(string.digits, k=length))
+    return f"{secrets.randbelow(_POW10[length]):0{length}d}"
 
-def _base_template(title: str, body_html: str) -> str:
-    return f"""<!DOCTYPE html><html><head><meta charset="UTF-8"></head>
+_BASE_TMPL = """<!DOCTYPE html><html><head><meta charset="UTF-8"></head>
     <body style="margin:0;padding:0;background:#F0F4F8;font-family:'Segoe UI',Arial,sans-serif;">
       <table width="100%" cellpadding="0" cellspacing="0" style="background:#F0F4F8;padding:40px 0;">
         <tr><td align="center">
@@ -47,7 +109,7 @@ def _base_template(title: str, body_html: str) -> str:
               <h1 style="margin:0;color:#fff;font-size:22px;font-weight:700;">◈ OpenCivil</h1>
               <p style="margin:4px 0 0;color:rgba(255,255,255,0.75);font-size:13px;">{title}</p>
             </td></tr>
-            <tr><td style="padding:36px 40px 40px;">{body_html}</td></tr>
+            <tr><td style="padding:36px 40px 40px;">{body}</td></tr>
             <tr><td style="padding:20px 40px;border-top:1px solid #F0F4F8;">
               <p style="margin:0;color:#94A3B8;font-size:11px;">
                 Sent by OpenCivil Analysis Engine. If you didn't request this, ignore it.
@@ -58,9 +120,13 @@ def _base_template(title: str, body_html: str) -> str:
       </table>
     </body></html>"""
 
-def send_verification_email(to_email: str, name: str, code: str):
-    body = f"""
-      <p style="margin:0 0 8px;color:#0F1C2E;font-size:16px;font-weight:600;">Hi {name.split()[0]}, welcome!</p>
+# Email bodies are rendered once at import with marker slots, then split on
+# them, so a send only joins a handful of prebuilt strings.
+_NAME_SLOT = "\x00name\x00"
+_CODE_SLOT = "\x00code\x00"
+
+_VERIFY_BODY = f"""
+      <p style="margin:0 0 8px;color:#0F1C2E;font-size:16px;font-weight:600;">Hi {_NAME_SLOT}, welcome!</p>
       <p style="margin:0 0 28px;color:#64748B;font-size:14px;line-height:1.6;">
         Use this code to verify your email. Expires in <strong>10 minutes</strong>.
       </p>
@@ -69,26 +135,110 @@ def send_verification_email(to_email: str, name: str, code: str):
         <p style="margin:0 0 6px;color:#94A3B8;font-size:12px;text-transform:uppercase;letter-spacing:1px;">
           Verification Code</p>
         <p style="margin:0;color:#0F1C2E;font-size:38px;font-weight:700;
-                  letter-spacing:10px;font-family:monospace;">{code}</p>
+                  letter-spacing:10px;font-family:monospace;">{_CODE_SLOT}</p>
       </div>
       <p style="margin:0;color:#94A3B8;font-size:13px;">Enter this in the OpenCivil app to activate your account.</p>
     """
-    _send(to_email, "Your OpenCivil verification code", _base_template("Email Verification", body))
 
-def send_reset_email(to_email: str, name: str, code: str):
-    first = name.split()[0] if name else "there"
-    body = f"""
+_RESET_BODY = f"""
       <p style="margin:0 0 8px;color:#0F1C2E;font-size:16px;font-weight:600;">Password reset requested</p>
       <p style="margin:0 0 28px;color:#64748B;font-size:14px;line-height:1.6;">
-        Hi {first}, use this code to reset your password. Expires in <strong>15 minutes</strong>.
+        Hi {_NAME_SLOT}, use this code to reset your password. Expires in <strong>15 minutes</strong>.
       </p>
       <div style="background:#FFF8F8;border:1.5px solid #FEE2E2;border-radius:12px;
                   padding:24px;text-align:center;margin-bottom:28px;">
         <p style="margin:0 0 6px;color:#94A3B8;font-size:12px;text-transform:uppercase;letter-spacing:1px;">
           Reset Code</p>
         <p style="margin:0;color:#DC2626;font-size:38px;font-weight:700;
-                  letter-spacing:10px;font-family:monospace;">{code}</p>
+                  letter-spacing:10px;font-family:monospace;">{_CODE_SLOT}</p>
       </div>
       <p style="margin:0;color:#94A3B8;font-size:13px;">If you didn't request this, ignore it — your account is safe.</p>
     """
-    _send(to_email, "Reset your OpenCivil password", _base_template("Password Reset", body))
+
+def _split_slots(html: str):
+    head, rest = html.split(_NAME_SLOT)
+    mid, tail  = rest.split(_CODE_SLOT)
+    return head, mid, tail
+
+_VERIFY_PREFIX, _VERIFY_MID, _VERIFY_SUFFIX = _split_slots(
+    _BASE_TMPL.format_map({"title": "Email Verification", "body": _VERIFY_BODY}))
+_RESET_PREFIX, _RESET_MID, _RESET_SUFFIX = _split_slots(
+    _BASE_TMPL.format_map({"title": "Password Reset", "body": _RESET_BODY}))
+
+def _first_name(name: str) -> str:
+    # Names are user-supplied and end up in HTML mail, so escape them.
+    return escape(name.strip().partition(" ")[0] or "there")
+
+def send_verification_email(to_email: str, name: str, code: str):
+    html = "".join([_VERIFY_PREFIX, _first_name(name), _VERIFY_MID, code, _VERIFY_SUFFIX])
+    _send(to_email, "Your OpenCivil verification code", html)
+
+def send_reset_email(to_email: str, name: str, code: str):
+    html = "".join([_RESET_PREFIX, _first_name(name or ""), _RESET_MID, code, _RESET_SUFFIX])
+    _send(to_email, "Reset your OpenCivil password", html)
+
+MAIL_QUEUE_MAX   = 1000
+MAIL_MAX_RETRIES = 3
+
+class _MailWorker(threading.Thread):
+    """
+    Sends queued emails on a daemon thread so callers never block on SMTP.
+    Failed sends are retried with exponential backoff (1s, 2s, 4s). Each job
+    carries a Future that resolves when the email is sent or given up on.
+    """
+
+    def __init__(self, jobs):
+        super().__init__(name="mail-worker", daemon=True)
+        self._jobs = jobs
+
+    def run(self):
+        while True:
+            send_fn, args, future = self._jobs.get()
+            try:
+                self._send_with_retry(send_fn, args)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(None)
+            finally:
+                self._jobs.task_done()
+
+    @staticmethod
+    def _send_with_retry(send_fn, args):
+        for attempt in range(MAIL_MAX_RETRIES + 1):
+            try:
+                send_fn(*args)
+                return
+            except (smtplib.SMTPException, OSError) as exc:
+                if attempt == MAIL_MAX_RETRIES:
+                    logger.error("Giving up on email to %s: %s", args[0], exc)
+                    raise
+                delay = 2 ** attempt
+                logger.warning("Email to %s failed (%s); retrying in %ss", args[0], exc, delay)
+                time.sleep(delay)
+            except Exception as exc:
+                logger.error("Email to %s failed: %s", args[0], exc)
+                raise
+
+_mail_queue  = queue.Queue(maxsize=MAIL_QUEUE_MAX)
+_mail_worker = None
+_worker_lock = threading.Lock()
+
+def _enqueue(send_fn, *args) -> Future:
+    global _mail_worker
+    if _mail_worker is None:
+        with _worker_lock:
+            if _mail_worker is None:
+                _mail_worker = _MailWorker(_mail_queue)
+                _mail_worker.start()
+    future = Future()
+    _mail_queue.put_nowait((send_fn, args, future))
+    return future
+
+def enqueue_verification_email(to_email: str, name: str, code: str) -> Future:
+    """Queue a verification email; raises queue.Full if the backlog is full."""
+    return _enqueue(send_verification_email, to_email, name, code)
+
+def enqueue_reset_email(to_email: str, name: str, code: str) -> Future:
+    """Queue a password-reset email; raises queue.Full if the backlog is full."""
+    return _enqueue(send_reset_email, to_email, name, code)
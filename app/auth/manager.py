@@ -1,7 +1,15 @@
-import json
 import logging
 import os
-from typing import Any, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+    _dumps, _loads = orjson.dumps, orjson.loads
+except ImportError:
+    import json
+    _dumps = lambda obj: json.dumps(obj, separators=(",", ":")).encode()
+    _loads = json.loads
 
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
@@ -9,10 +17,51 @@ from google.auth.transport.requests import Request
 from .config import GoogleAuthConfig
 from .dialog import LoginDialog
 
+from PyQt6.QtCore import QRunnable, QThreadPool
 from PyQt6.QtWidgets import QDialog
 
 logger = logging.getLogger(__name__)
 
+# One transport for every refresh so they share the requests.Session pool.
+_google_request = Request()
+
+# Refresh a little before Google's expiry rather than on a 401 mid-session.
+REFRESH_MARGIN = timedelta(minutes=5)
+
+def _needs_refresh(credentials: Credentials) -> bool:
+    if not credentials.refresh_token:
+        return False
+    if credentials.expiry is None:
+        return not credentials.token
+    # google-auth keeps expiry as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return credentials.expiry - now < REFRESH_MARGIN
+
+def _write_credentials(payload: Dict[str, Any], path) -> None:
+    # Write-then-rename so a crash never leaves a half-written file
+    # (which would force a full OAuth browser flow next launch).
+    try:
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, 'wb') as f:
+            f.write(_dumps(payload))
+        if hasattr(os, 'chmod'):
+            os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+        GoogleAuthManager._cred_cache = (os.stat(path).st_mtime, payload)
+    except Exception as exc:
+        logger.error("Could not save credentials: %s", exc)
+
+class _SaveCredsRunnable(QRunnable):
+    """Writes an already-built credentials payload on the global thread pool."""
+
+    def __init__(self, payload: Dict[str, Any], path):
+        super().__init__()
+        self._payload = payload
+        self._path    = path
+
+    def run(self):
+        _write_credentials(self._payload, self._path)
+
 class GoogleAuthManager:
     """
     High-level authentication manager for OpenCivil.
@@ -23,6 +72,10 @@ class GoogleAuthManager:
             sys.exit()          # user cancelled
     """
 
+    # (mtime, parsed payload) of the credentials file, shared by every
+    # manager in the process so restore_session() doesn't re-parse it.
+    _cred_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
     def __init__(self):
         self.user_info:   Optional[Dict[str, Any]] = None
         self.credentials: Optional[Credentials]    = None
@@ -46,7 +99,10 @@ class GoogleAuthManager:
             self.credentials = dialog.user_info.get('credentials')
 
             if dialog.remember_me:
-                self._save_credentials()
+                payload = self._credentials_payload()
+                if payload is not None:
+                    QThreadPool.globalInstance().start(
+                        _SaveCredsRunnable(payload, GoogleAuthConfig.CREDENTIALS_FILE))
 
             logger.info("Logged in: %s", self.get_user_email())
             return True
@@ -83,14 +139,29 @@ class GoogleAuthManager:
     def get_user_picture(self) -> Optional[str]:
         return self.user_info.get('picture') if self.user_info else None
 
+    def _read_credentials_file(self, path) -> Optional[Dict[str, Any]]:
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            GoogleAuthManager._cred_cache = None
+            return None
+        cached = GoogleAuthManager._cred_cache
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            data = _loads(f.read())
+        GoogleAuthManager._cred_cache = (mtime, data)
+        return data
+
     def _load_saved_credentials(self) -> bool:
-        path = GoogleAuthConfig.CREDENTIALS_FILE
-        if not os.path.exists(path):
-            return False
+        if self.user_info is not None and (self.credentials is None or self.credentials.valid):
+            return True
 
+        path = GoogleAuthConfig.CREDENTIALS_FILE
         try:
-            with open(path) as f:
-                data = json.load(f)
+            data = self._read_credentials_file(path)
+            if data is None:
+                return False
 
             if not data.get('remember_me'):
                 return False
@@ -107,9 +178,11 @@ class GoogleAuthManager:
                     client_secret = cred_data.get('client_secret'),
                     scopes        = cred_data.get('scopes'),
                 )
+                if cred_data.get('expiry'):
+                    credentials.expiry = datetime.fromisoformat(cred_data['expiry'])
 
-                if credentials.expired and credentials.refresh_token:
-                    credentials.refresh(Request())
+                if _needs_refresh(credentials):
+                    credentials.refresh(_google_request)
                     logger.info("Refreshed expired credentials.")
 
                 if not credentials.valid:
@@ -126,37 +199,33 @@ class GoogleAuthManager:
             self._remove_credentials_file()
             return False
 
-    def _save_credentials(self):
+    def _credentials_payload(self) -> Optional[Dict[str, Any]]:
         if not self.user_info:
-            return
-        try:
-            payload = {
-                'remember_me': True,
-                'user_info': {
-                    'name':    self.user_info.get('name'),
-                    'email':   self.user_info.get('email'),
-                    'picture': self.user_info.get('picture'),
-                    'provider': self.user_info.get('provider', 'google')
-                }
+            return None
+        payload = {
+            'remember_me': True,
+            'user_info': {
+                'name':    self.user_info.get('name'),
+                'email':   self.user_info.get('email'),
+                'picture': self.user_info.get('picture'),
+                'provider': self.user_info.get('provider', 'google')
             }
-            if self.credentials:
-                payload['credentials'] = {
-                    'token':         self.credentials.token,
-                    'refresh_token': self.credentials.refresh_token,
-                    'token_uri':     self.credentials.token_uri,
-                    'client_id':     self.credentials.client_id,
-                    'client_secret': self.credentials.client_secret,
-                    'scopes':        list(self.credentials.scopes or []),
-                }
-            path = GoogleAuthConfig.CREDENTIALS_FILE
-            with open(path, 'w') as f:
-                json.dump(payload, f, indent=2)
-            if hasattr(os, 'chmod'):
-                os.chmod(path, 0o600)
-        except Exception as exc:
-            logger.error("Could not save credentials: %s", exc)
+        }
+        if self.credentials:
+            payload['credentials'] = {
+                'token':         self.credentials.token,
+                'refresh_token': self.credentials.refresh_token,
+                'token_uri':     self.credentials.token_uri,
+                'client_id':     self.credentials.client_id,
+                'client_secret': self.credentials.client_secret,
+                'scopes':        list(self.credentials.scopes or []),
+                'expiry':        (self.credentials.expiry.isoformat()
+                                  if self.credentials.expiry else None),
+            }
+        return payload
 
     def _remove_credentials_file(self):
+        GoogleAuthManager._cred_cache = None
         path = GoogleAuthConfig.CREDENTIALS_FILE
         try:
             if os.path.exists(path):
@@ -1,13 +1,91 @@
 import logging
+import re
+import threading
+import time
 from PyQt6.QtCore import QThread, pyqtSignal
 
 from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.exceptions import GoogleAuthError
+from google.auth.transport.requests import Request
+from google.oauth2 import id_token
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .config import GoogleAuthConfig
+from . import email_auth
 
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive session for Google endpoints; retries transient 503/504s.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=2,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(503, 504)),
+))
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+class _CachingRequest:
+    """
+    google-auth transport that keeps successful GET responses for their
+    Cache-Control max-age, so Google's signing certs are downloaded once
+    per rotation rather than on every login.
+    """
+
+    DEFAULT_TTL = 3600.0
+
+    def __init__(self, request):
+        self._request = request
+        self._cache   = {}
+        self._lock    = threading.Lock()
+
+    def __call__(self, url, method="GET", body=None, headers=None,
+                 timeout=None, **kwargs):
+        if method != "GET" or body is not None:
+            return self._request(url, method=method, body=body,
+                                 headers=headers, timeout=timeout, **kwargs)
+
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(url)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+
+        response = self._request(url, method=method, headers=headers,
+                                 timeout=timeout, **kwargs)
+        if response.status == 200:
+            with self._lock:
+                self._cache[url] = (now + self._max_age(response.headers), response)
+        return response
+
+    def _max_age(self, headers) -> float:
+        m = _MAX_AGE_RE.search(headers.get("cache-control", ""))
+        return float(m.group(1)) if m else self.DEFAULT_TTL
+
+_google_request = _CachingRequest(Request(session=_session))
+
+def _profile_from_id_token(token: str) -> dict:
+    """The openid scope puts the profile in the signed ID token, so no userinfo call is needed."""
+    claims = id_token.verify_oauth2_token(token, _google_request, GoogleAuthConfig.CLIENT_ID)
+    return {
+        'id':      claims['sub'],
+        'email':   claims.get('email'),
+        'name':    claims.get('name', ''),
+        'picture': claims.get('picture'),
+    }
+
+def _profile_from_userinfo(credentials) -> dict:
+    headers  = {'Authorization': f'Bearer {credentials.token}'}
+    response = _session.get(
+        GoogleAuthConfig.USER_INFO_URL,
+        headers=headers,
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.json()
+
 class GoogleAuthThread(QThread):
     """
     Runs the Google OAuth2 browser flow in a background thread
@@ -59,16 +137,17 @@ class GoogleAuthThread(QThread):
 
             self.auth_progress.emit("Fetching your profile…")
 
-            headers  = {'Authorization': f'Bearer {credentials.token}'}
-            response = requests.get(
-                GoogleAuthConfig.USER_INFO_URL,
-                headers=headers,
-                timeout=10,
-            )
-            response.raise_for_status()
-            user_info = response.json()
+            user_info = None
+            if getattr(credentials, 'id_token', None):
+                try:
+                    user_info = _profile_from_id_token(credentials.id_token)
+                except (ValueError, GoogleAuthError) as exc:
+                    # Clock skew or a cert fetch failure; the access token still works.
+                    logger.warning("ID token verification failed, using userinfo: %s", exc)
+            if user_info is None:
+                user_info = _profile_from_userinfo(credentials)
 
-            if 'email' not in user_info:
+            if not user_info.get('email'):
                 raise ValueError("Google did not return an email address.")
 
             user_info['credentials'] = credentials
@@ -83,3 +162,33 @@ class GoogleAuthThread(QThread):
         except Exception as exc:
             logger.exception("Unexpected auth error")
             self.auth_failed.emit(f"Authentication failed: {exc}")
+
+class EmailAuthThread(QThread):
+    """
+    Runs one email_auth call (database + SMTP round-trips) off the UI thread.
+    Emits finished_result(ok, error_message, data) with the call's result.
+    """
+
+    finished_result = pyqtSignal(bool, str, object)
+
+    _OPS = {
+        "login":         email_auth.login,
+        "register":      email_auth.register,
+        "forgot":        email_auth.send_forgot_password,
+        "resend_verify": email_auth.resend_verification,
+        "verify":        email_auth.confirm_verification,
+        "reset":         email_auth.confirm_reset,
+    }
+
+    def __init__(self, op: str, *args, parent=None):
+        super().__init__(parent)
+        self._fn   = self._OPS[op]
+        self._args = args
+
+    def run(self):
+        try:
+            ok, err, data = self._fn(*self._args)
+        except Exception as exc:
+            logger.exception("Email auth error")
+            ok, err, data = False, f"Authentication failed: {exc}", None
+        self.finished_result.emit(ok, err, data)
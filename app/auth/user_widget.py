@@ -5,18 +5,26 @@ Floating top-right user profile widget for OpenCivil's MainWindow.
 """
 
 import os
+import time
+import hashlib
+import weakref
+import threading
+import urllib.error
 import urllib.request
-import tempfile
+from email.utils import formatdate
+from collections import OrderedDict
+from pathlib import Path
 
 from PyQt6.QtCore import (
     Qt, QTimer, QPoint, QRect,
-    pyqtSignal, QThread, pyqtSignal as Signal,
+    pyqtSignal, QObject, QRunnable, QThreadPool,
     QPropertyAnimation, QEasingCurve, QParallelAnimationGroup
 )
 from PyQt6.QtGui import (
     QFont, QColor, QPainter, QPainterPath,
-    QPixmap, QPen, QLinearGradient
+    QPixmap, QImage, QPen, QLinearGradient
 )
+from PyQt6 import sip
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QPushButton,
     QVBoxLayout, QHBoxLayout,
@@ -31,25 +39,184 @@ DANGER         = "#DC2626"
 DANGER_HOVER   = "rgba(220,38,38,8)"
 HOVER_ITEM     = "rgba(15,28,46,6)"
 AVATAR_SIZE    = 36
+DROPDOWN_AVATAR = 46
 DROPDOWN_W     = 300
 
-class AvatarFetcher(QThread):
-    done = Signal(str)
+AVATAR_CACHE_DIR = Path.home() / ".opencivil" / "avatars"
+AVATAR_TTL       = 7 * 86400          # seconds before revalidating with the CDN
+AVATAR_CACHE_CAP = 2 * 1024 * 1024    # bytes kept on disk
+
+_prune_once = threading.Lock()
+_pruned     = False
+
+def _avatar_url(url: str) -> str:
+    if "googleusercontent.com" in url and "=s" not in url:
+        url += "=s96-c"
+    return url
+
+def _cache_path_for(url: str) -> Path:
+    return AVATAR_CACHE_DIR / (hashlib.sha1(_avatar_url(url).encode()).hexdigest() + ".jpg")
+
+def _prune_cache():
+    """Drop the oldest cached avatars once per process so the dir stays under the cap."""
+    global _pruned
+    with _prune_once:
+        if _pruned:
+            return
+        _pruned = True
+    try:
+        files = sorted(AVATAR_CACHE_DIR.glob("*.jpg"), key=lambda f: f.stat().st_mtime)
+        total = sum(f.stat().st_size for f in files)
+        for f in files:
+            if total <= AVATAR_CACHE_CAP:
+                break
+            total -= f.stat().st_size
+            f.unlink()
+    except OSError:
+        pass
+
+def _decode_avatar(path: Path):
+    """
+    Decode and pre-scale an avatar. QImage (unlike QPixmap) is safe off the
+    GUI thread, so the pool worker does this. Returns {size: QImage}, where
+    0 is the full image, or None if the file isn't a readable image.
+    """
+    img = QImage(str(path))
+    if img.isNull():
+        return None
+    images = {0: img}
+    for size in (AVATAR_SIZE, DROPDOWN_AVATAR):
+        images[size] = img.scaled(
+            size, size,
+            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+            Qt.TransformationMode.SmoothTransformation
+        )
+    return images
+
+# (url, size) -> QPixmap, shared by every widget. GUI thread only.
+_PIXMAP_CACHE_MAX = 32
+_pixmaps: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+
+def _store_avatar(url: str, images: dict):
+    for size, img in images.items():
+        _pixmaps[(url, size)] = QPixmap.fromImage(img)
+        _pixmaps.move_to_end((url, size))
+    while len(_pixmaps) > _PIXMAP_CACHE_MAX:
+        _pixmaps.popitem(last=False)
+
+def _get_avatar_pixmap(url: str, size: int = 0) -> QPixmap:
+    """Avatar for url; size > 0 gives the cropped-to-fill square variant."""
+    px = _pixmaps.get((url, size))
+    if px is None:
+        # Evicted since the fetch: decode again here.
+        images = _decode_avatar(_cache_path_for(url))
+        if images is None:
+            raise FileNotFoundError(url)
+        _store_avatar(url, images)
+        px = _pixmaps[(url, size)]
+    else:
+        _pixmaps.move_to_end((url, size))
+    return px
+
+_avatar_pool = None
+
+def _pool() -> QThreadPool:
+    """Small dedicated pool for avatar downloads (created on first use)."""
+    global _avatar_pool
+    if _avatar_pool is None:
+        _avatar_pool = QThreadPool()
+        _avatar_pool.setMaxThreadCount(2)
+    return _avatar_pool
+
+class _FetcherSignals(QObject):
+    done = pyqtSignal(str, object)      # (path, {size: QImage} or None)
+
+class AvatarFetcher(QRunnable):
+    """
+    One avatar download on the pool. QRunnable can't emit, so results go
+    out through a QObject created on the GUI thread.
+    """
 
     def __init__(self, url: str):
         super().__init__()
-        self._url = url
+        self._url      = url
+        self.signals   = _FetcherSignals()
+        self.done      = self.signals.done
+        self.cancelled = threading.Event()
 
     def run(self):
+        # Always emit, even when cancelled, so the in-flight entry is cleared.
+        path   = None if self.cancelled.is_set() else self._fetch()
+        images = _decode_avatar(path) if path and not self.cancelled.is_set() else None
+        self.done.emit(str(path) if images else "", images)
+
+    def _fetch(self):
+        """Return the cached file path, downloading if needed; None on failure."""
+        path = _cache_path_for(self._url)
         try:
-            url = self._url
-            if "googleusercontent.com" in url and "=s" not in url:
-                url += "=s96-c"
-            tmp = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
-            urllib.request.urlretrieve(url, tmp.name)
-            self.done.emit(tmp.name)
+            AVATAR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _prune_cache()
+            mtime = path.stat().st_mtime if path.exists() else None
+            if mtime is not None and time.time() - mtime < AVATAR_TTL:
+                return path
+
+            req = urllib.request.Request(_avatar_url(self._url))
+            if mtime is not None:
+                req.add_header("If-Modified-Since", formatdate(mtime, usegmt=True))
+            try:
+                with urllib.request.urlopen(req, timeout=10) as resp:
+                    body = resp.read()
+            except urllib.error.HTTPError as exc:
+                if exc.code != 304:
+                    raise
+                os.utime(path)                    # still current; restart the TTL
+                return path
+
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+            return path
         except Exception:
-            self.done.emit("")
+            # Offline: a stale copy beats the initials.
+            return path if path.exists() else None
+
+# url -> (signals, cancelled, waiting widgets). GUI thread only. A widget
+# asking for an avatar that is already being fetched joins that fetch; the
+# entry also keeps the signal object alive until its result is delivered.
+_inflight = {}
+
+def _fetch_avatar(url: str, widget):
+    entry = _inflight.get(url)
+    fetcher = None
+    if entry is None:
+        fetcher = AvatarFetcher(url)
+        entry = _inflight[url] = (fetcher.signals, fetcher.cancelled, weakref.WeakSet())
+        fetcher.done.connect(lambda *_: _retire_fetch(url))
+    entry[2].add(widget)
+    entry[0].done.connect(widget._on_avatar_fetched)
+    if fetcher is not None:
+        _pool().start(fetcher)
+
+def _retire_fetch(url: str):
+    entry = _inflight.pop(url, None)
+    if entry is not None:
+        # The widgets' queued slots for this emission are still pending;
+        # hold the signal object until they have run.
+        QTimer.singleShot(0, lambda: entry)
+
+def _drop_avatar_fetch(url: str, widget):
+    """Detach widget from a pending fetch; cancel it if nobody else is waiting."""
+    entry = _inflight.get(url)
+    if entry is None:
+        return
+    signals, cancelled, waiters = entry
+    try:
+        signals.done.disconnect(widget._on_avatar_fetched)
+    except TypeError:
+        pass
+    waiters.discard(widget)
+    if not waiters:
+        cancelled.set()
 
 class AvatarLabel(QLabel):
     def __init__(self, size=AVATAR_SIZE, parent=None):
@@ -57,6 +224,8 @@ class AvatarLabel(QLabel):
         self._size     = size
         self._pixmap   = None
         self._initials = "?"
+        self._cached   = None       # fully rendered avatar for _cached_dpr
+        self._cached_dpr = 0.0
         self.setFixedSize(size, size)
 
     def set_pixmap(self, pixmap: QPixmap):
@@ -65,18 +234,38 @@ class AvatarLabel(QLabel):
             Qt.AspectRatioMode.KeepAspectRatioByExpanding,
             Qt.TransformationMode.SmoothTransformation
         )
+        self._cached = None
+        self.update()
+
+    def set_avatar(self, url: str):
+        self._pixmap = _get_avatar_pixmap(url, self._size)
+        self._cached = None
         self.update()
 
     def set_initials(self, name: str):
         parts = name.strip().split()
         self._initials = "".join(p[0].upper() for p in parts[:2]) if parts else "?"
         self._pixmap   = None
+        self._cached   = None
         self.update()
 
     def paintEvent(self, _event):
+        dpr = self.devicePixelRatioF()
+        if self._cached is None or self._cached_dpr != dpr:
+            self._cached     = self._render(dpr)
+            self._cached_dpr = dpr
         p = QPainter(self)
+        p.drawPixmap(0, 0, self._cached)
+        p.end()
+
+    def _render(self, dpr: float) -> QPixmap:
+        s   = self._size
+        out = QPixmap(round(s * dpr), round(s * dpr))
+        out.setDevicePixelRatio(dpr)
+        out.fill(Qt.GlobalColor.transparent)
+
+        p = QPainter(out)
         p.setRenderHint(QPainter.RenderHint.Antialiasing)
-        s = self._size
 
         clip = QPainterPath()
         clip.addEllipse(0, 0, s, s)
@@ -103,6 +292,7 @@ class AvatarLabel(QLabel):
         p.setBrush(Qt.BrushStyle.NoBrush)
         p.drawEllipse(0, 0, s - 1, s - 1)
         p.end()
+        return out
 
 class UserDropdown(QWidget):
     logout_requested = pyqtSignal()
@@ -145,7 +335,7 @@ class UserDropdown(QWidget):
         h.setContentsMargins(18, 18, 18, 16)
         h.setSpacing(14)
 
-        self.avatar_big = AvatarLabel(size=46)
+        self.avatar_big = AvatarLabel(size=DROPDOWN_AVATAR)
         name = self._user_info.get('name', '')
         self.avatar_big.set_initials(name)
         h.addWidget(self.avatar_big, 0, Qt.AlignmentFlag.AlignVCenter)
@@ -230,6 +420,9 @@ class UserDropdown(QWidget):
     def set_avatar_pixmap(self, pixmap: QPixmap):
         self.avatar_big.set_pixmap(pixmap)
 
+    def set_avatar(self, url: str):
+        self.avatar_big.set_avatar(url)
+
 class UserProfileWidget(QWidget):
     logout_requested = pyqtSignal()
 
@@ -238,8 +431,13 @@ class UserProfileWidget(QWidget):
         self._auth          = auth_manager
         self._info          = auth_manager.user_info or {}
         self._dropdown      = None
-        self._avatar_pixmap = None
-        self._fetcher       = None
+        self._avatar_url    = None
+
+        # Parent resize storms are coalesced to one reposition per frame.
+        self._reposition_timer = QTimer(self)
+        self._reposition_timer.setSingleShot(True)
+        self._reposition_timer.setInterval(16)
+        self._reposition_timer.timeout.connect(self._do_reposition)
 
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self.setFixedHeight(42)
@@ -302,24 +500,25 @@ class UserProfileWidget(QWidget):
         url = self._info.get('picture', '')
         if not url:
             return
-        self._fetcher = AvatarFetcher(url)
-        self._fetcher.done.connect(self._on_avatar_fetched)
-        self._fetcher.start()
+        _fetch_avatar(url, self)
 
-    def _on_avatar_fetched(self, path: str):
-        if not path:
-            return
-        px = QPixmap(path)
-        if px.isNull():
+    def _cancel_avatar_fetch(self):
+        url = self._info.get('picture', '')
+        if url:
+            _drop_avatar_fetch(url, self)
+
+    def _on_avatar_fetched(self, path: str, images):
+        if sip.isdeleted(self) or not images:
             return
-        self._avatar_pixmap = px
-        self.avatar.set_pixmap(px)
+        url = self._info.get('picture', '')
+        _store_avatar(url, images)
+        self._avatar_url = url
+        self.avatar.set_avatar(url)
         if self._dropdown:
-            self._dropdown.set_avatar_pixmap(px)
-        try:
-            os.unlink(path)
-        except OSError:
-            pass
+            self._dropdown.set_avatar(url)
+
+    def _do_reposition(self):
+        self.reposition()
 
     def reposition(self):
         if not self.parent():
@@ -359,8 +558,8 @@ class UserProfileWidget(QWidget):
         if not self._dropdown:
             self._dropdown = UserDropdown(self._info, parent=self.window())
             self._dropdown.logout_requested.connect(self._on_logout)
-            if self._avatar_pixmap:
-                self._dropdown.set_avatar_pixmap(self._avatar_pixmap)
+            if self._avatar_url:
+                self._dropdown.set_avatar(self._avatar_url)
 
         pos  = self.mapTo(self.window(), QPoint(0, self.height() + 8))
         dx   = pos.x() + self.width() - DROPDOWN_W - 24
@@ -394,6 +593,7 @@ class UserProfileWidget(QWidget):
         self.lbl_chevron.setText("▴")
 
     def _on_logout(self):
+        self._cancel_avatar_fetch()
         if self._dropdown:
             self._dropdown.hide()
         self._auth.logout()
@@ -405,7 +605,8 @@ class UserProfileWidget(QWidget):
         if obj is self.parent() and event.type() in (
             QEvent.Type.Resize, QEvent.Type.Show
         ):
-            self.reposition()
+            if not self._reposition_timer.isActive():
+                self._reposition_timer.start()
 
         if self._dropdown and self._dropdown.isVisible():
             if event.type() == QEvent.Type.MouseButtonPress:
@@ -421,4 +622,5 @@ class UserProfileWidget(QWidget):
     def closeEvent(self, event):
         from PyQt6.QtWidgets import QApplication
         QApplication.instance().removeEventFilter(self)
+        self._cancel_avatar_fetch()
         super().closeEvent(event)
@@ -306,6 +306,7 @@ class StructuralModel:
                 "p_delta": lc.p_delta,
                 "mass_source": lc.mass_source,
                 "num_modes": getattr(lc, 'num_modes', 12),
+                "mass_precision": getattr(lc, 'mass_precision', 'fp64'),
                 "rsa_loads": getattr(lc, 'rsa_loads', []),
                 "modal_comb": getattr(lc, 'modal_comb', 'SRSS'),
                 "dir_comb": getattr(lc, 'dir_comb', 'SRSS'),
@@ -584,6 +585,7 @@ class StructuralModel:
                 new_lc.p_delta = lc_data.get("p_delta", False)
                 new_lc.mass_source = lc_data.get("mass_source", "Default")
                 new_lc.num_modes = lc_data.get("num_modes", 12)
+                new_lc.mass_precision = lc_data.get("mass_precision", "fp64")
                 new_lc.modal_damping = lc_data.get("modal_damping", 0.05)
                 new_lc.damping    = lc_data.get("ltha_damping", 0.05)
                 new_lc.ltha_loads = [tuple(x) for x in lc_data.get("ltha_loads", [])]
@@ -969,4 +971,5 @@ class LoadCase:
         self.p_delta = False                                   
         self.modal_case = None                                                     
         self.num_modes = 12
+        self.mass_precision = "fp64"    # "fp32" halves mass-assembly memory traffic
         self.ltha_loads = []
@@ -1,9 +1,105 @@
                                                           
+import logging
+from functools import lru_cache
+from types import MappingProxyType
+
 import numpy as np
-from scipy.sparse import lil_matrix
+from scipy.linalg import solve
+from scipy.sparse import coo_matrix
 from element_library import get_local_stiffness_matrix, get_rotation_matrix, get_eccentricity_matrix
 from matrix_spy import MatrixSpy
 
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Below this many elements numba's thread start-up outweighs the gain.
+PARALLEL_MIN_ELEMENTS = 2000
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _congruent_transform_nb(k, T):
+        n = k.shape[0]
+        out = np.empty_like(k)
+        for e in prange(n):
+            kt = np.zeros((12, 12))
+            for i in range(12):
+                for j in range(12):
+                    acc = 0.0
+                    for m in range(12):
+                        acc += k[e, i, m] * T[e, m, j]
+                    kt[i, j] = acc
+            for i in range(12):
+                for j in range(12):
+                    acc = 0.0
+                    for m in range(12):
+                        acc += T[e, m, i] * kt[m, j]
+                    out[e, i, j] = acc
+        return out
+
+def _congruent_transform(k, T):
+    """T^T k T for stacks of 12x12 matrices; threaded with numba when installed."""
+    if njit is not None and k.shape[0] >= PARALLEL_MIN_ELEMENTS:
+        return _congruent_transform_nb(np.ascontiguousarray(k), np.ascontiguousarray(T))
+    return np.matmul(T.transpose(0, 2, 1), np.matmul(k, T))
+
+
+# Fixed-end forces of a uniform load over the clear span, as a linear map of
+# [wx*L, wy*L, wz*L, wy*L^2, wz*L^2].
+_FEF_DIST_M = np.array([
+    [-0.5,  0.0,  0.0,   0.0,     0.0],
+    [ 0.0, -0.5,  0.0,   0.0,     0.0],
+    [ 0.0,  0.0, -0.5,   0.0,     0.0],
+    [ 0.0,  0.0,  0.0,   0.0,     0.0],
+    [ 0.0,  0.0,  0.0,   0.0,     1/12],
+    [ 0.0,  0.0,  0.0,  -1/12,    0.0],
+    [-0.5,  0.0,  0.0,   0.0,     0.0],
+    [ 0.0, -0.5,  0.0,   0.0,     0.0],
+    [ 0.0,  0.0, -0.5,   0.0,     0.0],
+    [ 0.0,  0.0,  0.0,   0.0,     0.0],
+    [ 0.0,  0.0,  0.0,   0.0,    -1/12],
+    [ 0.0,  0.0,  0.0,   1/12,    0.0],
+])
+
+# Direction strings the load dialogs emit -> (axis index, sign).
+_DIR_MAP = MappingProxyType({
+    "GRAVITY": (2, -1.0),
+    "X": (0, 1.0), "Y": (1, 1.0), "Z": (2, 1.0),
+    "1": (0, 1.0), "2": (1, 1.0), "3": (2, 1.0),
+    "1 (AXIAL)": (0, 1.0), "2 (MAJOR)": (1, 1.0), "3 (MINOR)": (2, 1.0),
+})
+
+@lru_cache(maxsize=256)
+def _legacy_direction(d):
+    """Substring rules for direction strings older files wrote; None if nothing matches."""
+    if "GRAVITY" in d: return (2, -1.0)
+    if "X" in d or "1" in d: return (0, 1.0)
+    if "Y" in d or "2" in d: return (1, 1.0)
+    if "Z" in d or "3" in d: return (2, 1.0)
+    return None
+
+@lru_cache(maxsize=4096)
+def _k_local_cached(E, G, A, J, I22, I33, As2, As3, L, L_tor):
+    k = get_local_stiffness_matrix(E=E, G=G, A=A, J=J, I22=I22, I33=I33,
+                                   As2=As2, As3=As3, L=L, L_tor=L_tor)
+    k.flags.writeable = False       # shared between callers
+    return k
+
+def _k_local(mat, sec, L, L_tor):
+    """
+    Cached local stiffness. Models reuse a few (material, section, length)
+    combinations across many members, and the load passes ask again for
+    the same members. The returned array is read-only.
+    """
+    return _k_local_cached(
+        float(mat['E']), float(mat['G']), float(sec['A']), float(sec['J']),
+        float(sec['I22']), float(sec['I33']), float(sec['As2']), float(sec['As3']),
+        float(L), float(L_tor),
+    )
+
 class GlobalAssembler:
     def __init__(self, data_manager,export_path=None):
         self.dm = data_manager
@@ -11,13 +107,14 @@ class GlobalAssembler:
 
         self.dm = data_manager
                                   
-        self.K = lil_matrix((self.dm.total_dofs, self.dm.total_dofs))
+        self.K = None
                                 
         self.P = np.zeros(self.dm.total_dofs)
 
     def assemble_system(self):
         """Master function to build K and P."""
         print("Assembler: Building Stiffness Matrix...")
+        self._prepare_element_transforms()
         self._build_stiffness()
 
         print("Assembler: Applying Diaphragm Constraints...")            
@@ -33,23 +130,23 @@ class GlobalAssembler:
         self.spy.save_to_json()
         return self.K, self.P
 
-    def _build_stiffness(self):
-        for el in self.dm.elements:
-                                          
-            mat = el['material']
-            sec = el['section']
-            L = el['L_clear'] 
-            L_total = el['L_total']
-            
-            k_local = get_local_stiffness_matrix(
-                E=mat['E'], G=mat['G'], A=sec['A'], J=sec['J'],
-                I22=sec['I22'], I33=sec['I33'],
-                As2=sec['As2'], As3=sec['As3'], L=L, L_tor=L_total
-            )
-
-            if any(el['releases'][0]) or any(el['releases'][1]):
-                k_local = self._condense_matrix(k_local, el['releases'])
-
+    def _prepare_element_transforms(self):
+        """
+        Computes R, T_total and the local insertion offsets once per element.
+        The stiffness and member-load passes both read them (as stacked
+        arrays here and as el['_R'], el['_T_total'], el['_off_ins'],
+        el['_plain']), so
+        the loads see exactly the transform the stiffness used.
+        """
+        n_el = len(self.dm.elements)
+        R = np.empty((n_el, 3, 3))
+        T_ecc = np.empty((n_el, 12, 12))
+        plain = np.zeros(n_el, dtype=bool)     # no rigid or end offsets: T_ecc == I
+        dof = np.empty((n_el, 12), dtype=np.int64)
+        dof6 = np.arange(6)
+        off_ins = []
+
+        for e, el in enumerate(self.dm.elements):
             idx_i, idx_j = el['node_indices']
             p1 = self.dm.nodes[idx_i]['coords']
             p2 = self.dm.nodes[idx_j]['coords']
@@ -61,70 +158,108 @@ class GlobalAssembler:
             p2_adj = p2 + global_off_j
             
             R_3x3 = get_rotation_matrix(p1_adj, p2_adj, el['beta'])
-            
-            T_rot = np.zeros((12, 12))
-            for i in range(4): 
-                T_rot[i*3:(i+1)*3, i*3:(i+1)*3] = R_3x3
-            
-            global_off_i = np.array(el['offsets'][0]) 
-            global_off_j = np.array(el['offsets'][1])
+            R[e] = R_3x3
 
-            local_off_i = R_3x3 @ global_off_i
-            local_off_j = R_3x3 @ global_off_j
-            
+            ins_i = R_3x3 @ global_off_i
+            ins_j = R_3x3 @ global_off_j
+            off_ins.append((ins_i, ins_j))
+
+            local_off_i = ins_i.copy()
+            local_off_j = ins_j.copy()
             local_off_i[0] += el.get('end_off_i', 0.0) 
             local_off_j[0] -= el.get('end_off_j', 0.0)
 
-            T_ecc = get_eccentricity_matrix(local_off_i, local_off_j) 
-                                   
-            T_total = T_ecc @ T_rot
+            if np.abs(local_off_i).sum() + np.abs(local_off_j).sum() < 1e-12:
+                plain[e] = True
+            else:
+                T_ecc[e] = get_eccentricity_matrix(local_off_i, local_off_j)
+
+            dof[e, :6] = idx_i * 6 + dof6
+            dof[e, 6:] = idx_j * 6 + dof6
 
-            self.spy.record_matrices(el['id'], k_local, T_total)
+        # Block-diagonal T_rot for every element: four copies of R.
+        T_rot = np.zeros((n_el, 4, 3, 4, 3))
+        for b in range(4):
+            T_rot[:, b, :, b, :] = R
+        T_total = T_rot.reshape(n_el, 12, 12)
+        ecc = ~plain
+        T_total[ecc] = np.matmul(T_ecc[ecc], T_total[ecc])
 
-            k_global = T_total.T @ k_local @ T_total
+        for e, el in enumerate(self.dm.elements):
+            el['_R'] = R[e]
+            el['_T_total'] = T_total[e]
+            el['_off_ins'] = off_ins[e]
+            el['_plain'] = bool(plain[e])
 
-            start_i = idx_i * 6
-            start_j = idx_j * 6
+        self._R, self._T_total, self._plain, self._dof = R, T_total, plain, dof
+
+    def _build_stiffness(self):
+        """
+        Transforms every element's k_local with batched matmuls and converts
+        one set of COO triplets; duplicate (row, col) entries are summed by
+        scipy. Needs _prepare_element_transforms() first.
+        """
+        n = self.dm.total_dofs
+        n_el = len(self.dm.elements)
+        k_loc = np.empty((n_el, 12, 12))
+
+        for e, el in enumerate(self.dm.elements):
+                                          
+            mat = el['material']
+            sec = el['section']
+            L = el['L_clear'] 
+            L_total = el['L_total']
             
-            self.K[start_i:start_i+6, start_i:start_i+6] += k_global[0:6, 0:6]
-            self.K[start_i:start_i+6, start_j:start_j+6] += k_global[0:6, 6:12]
-            self.K[start_j:start_j+6, start_i:start_i+6] += k_global[6:12, 0:6]
-            self.K[start_j:start_j+6, start_j:start_j+6] += k_global[6:12, 6:12]
+            k_local = _k_local(mat, sec, L, L_total)
+
+            if any(el['releases'][0]) or any(el['releases'][1]):
+                k_local = self._condense_matrix(k_local, el['releases'])
+            k_loc[e] = k_local
+
+        R, T_total, plain, dof = self._R, self._T_total, self._plain, self._dof
+        ecc = ~plain
+
+        self.spy.record_batch([el['id'] for el in self.dm.elements], k_loc, T_total)
+
+        k_global = np.empty((n_el, 12, 12))
+        # Without offsets T_total is block-diagonal, so each 3x3 block of k
+        # just becomes R^T k_IJ R.
+        k_blocks = k_loc[plain].reshape(-1, 4, 3, 4, 3)
+        R_p = R[plain]
+        k_global[plain] = np.einsum('nxa,nIxJy,nyb->nIaJb', R_p, k_blocks, R_p,
+                                    optimize=True).reshape(-1, 12, 12)
+        k_global[ecc] = _congruent_transform(k_loc[ecc], T_total[ecc])
+
+        rows = np.repeat(dof, 12, axis=1).ravel()
+        cols = np.tile(dof, (1, 12)).ravel()
+        self.K = coo_matrix((k_global.ravel(), (rows, cols)), shape=(n, n)).tocsr()
+        self.K.eliminate_zeros()
 
     def _condense_matrix(self, k, releases):
-        rel_vec = releases[0] + releases[1]
-        idx_k = [i for i, r in enumerate(rel_vec) if not r]
-        idx_c = [i for i, r in enumerate(rel_vec) if r]
-        
-        if not idx_c:
-            return k 
-        
+        rel = np.array(releases[0] + releases[1], dtype=bool)
+        idx_c = np.flatnonzero(rel)
+        if idx_c.size == 0:
+            return k
+        idx_k = np.flatnonzero(~rel)
+
         K_rr = k[np.ix_(idx_k, idx_k)]
         K_rc = k[np.ix_(idx_k, idx_c)]
         K_cr = k[np.ix_(idx_c, idx_k)]
         K_cc = k[np.ix_(idx_c, idx_c)]
-        
+
         try:
-            K_cc_inv = np.linalg.inv(K_cc)
+            K_new_small = K_rr - K_rc @ solve(K_cc, K_cr, assume_a='pos')
         except np.linalg.LinAlgError:
-            print("Warning: Unstable release configuration detected.")
+            logger.warning("Unstable release configuration detected.")
             return k
 
-        K_new_small = K_rr - K_rc @ K_cc_inv @ K_cr
-        
         k_final = np.zeros((12, 12))
-        for r_i, old_r in enumerate(idx_k):
-            for c_i, old_c in enumerate(idx_k):
-                k_final[old_r, old_c] = K_new_small[r_i, c_i]
-
-        k_ref = np.max(np.abs(k))
-        penalty = k_ref * 1e-8
-
-        rot_dofs = [3, 4, 5, 9, 10, 11]
+        k_final[np.ix_(idx_k, idx_k)] = K_new_small
 
-        for i, released in enumerate(rel_vec):
-            if released and i in rot_dofs:
-                k_final[i, i] += penalty
+        # Small spring on released rotations keeps K non-singular.
+        penalty = np.max(np.abs(k)) * 1e-8
+        rot_rel = idx_c[idx_c % 6 >= 3]
+        k_final[rot_rel, rot_rel] += penalty
 
         return k_final
 
@@ -150,6 +285,11 @@ class GlobalAssembler:
 
         node_by_id = {n['id']: n for n in self.dm.nodes}
 
+        # Penalty terms are gathered as triplets and added to K in one go.
+        d_rows, d_cols, d_vals = [], [], []
+        def add(r, c, v):
+            d_rows.append(r); d_cols.append(c); d_vals.append(v)
+
         for dia_name, node_ids in self.dm.diaphragm_groups.items():
             if len(node_ids) < 2:
                 continue
@@ -170,32 +310,37 @@ class GlobalAssembler:
                 ux_s, uy_s, rz_s = si+0, si+1, si+5
                 ux_m, uy_m, rz_m = mi+0, mi+1, mi+5
 
-                self.K[ux_s, ux_s] += alpha
-                self.K[ux_s, ux_m] -= alpha
-                self.K[ux_s, rz_m] += alpha * dY
-                self.K[ux_m, ux_s] -= alpha
-                self.K[ux_m, ux_m] += alpha
-                self.K[ux_m, rz_m] -= alpha * dY
-                self.K[rz_m, ux_s] += alpha * dY
-                self.K[rz_m, ux_m] -= alpha * dY
-                self.K[rz_m, rz_m] += alpha * dY**2
-
-                self.K[uy_s, uy_s] += alpha
-                self.K[uy_s, uy_m] -= alpha
-                self.K[uy_s, rz_m] -= alpha * dX
-                self.K[uy_m, uy_s] -= alpha
-                self.K[uy_m, uy_m] += alpha
-                self.K[uy_m, rz_m] += alpha * dX
-                self.K[rz_m, uy_s] -= alpha * dX
-                self.K[rz_m, uy_m] += alpha * dX
-                self.K[rz_m, rz_m] += alpha * dX**2
-
-                self.K[rz_s, rz_s] += alpha
-                self.K[rz_s, rz_m] -= alpha
-                self.K[rz_m, rz_s] -= alpha
-                self.K[rz_m, rz_m] += alpha
-
-            print(f"      Diaphragm '{dia_name}': {len(node_ids)} nodes, master=Node {master_id}, α={alpha:.2e}")
+                add(ux_s, ux_s, alpha)
+                add(ux_s, ux_m, -alpha)
+                add(ux_s, rz_m, alpha * dY)
+                add(ux_m, ux_s, -alpha)
+                add(ux_m, ux_m, alpha)
+                add(ux_m, rz_m, -alpha * dY)
+                add(rz_m, ux_s, alpha * dY)
+                add(rz_m, ux_m, -alpha * dY)
+                add(rz_m, rz_m, alpha * dY**2)
+
+                add(uy_s, uy_s, alpha)
+                add(uy_s, uy_m, -alpha)
+                add(uy_s, rz_m, -alpha * dX)
+                add(uy_m, uy_s, -alpha)
+                add(uy_m, uy_m, alpha)
+                add(uy_m, rz_m, alpha * dX)
+                add(rz_m, uy_s, -alpha * dX)
+                add(rz_m, uy_m, alpha * dX)
+                add(rz_m, rz_m, alpha * dX**2)
+
+                add(rz_s, rz_s, alpha)
+                add(rz_s, rz_m, -alpha)
+                add(rz_m, rz_s, -alpha)
+                add(rz_m, rz_m, alpha)
+
+            logger.debug("Diaphragm '%s': %d nodes, master=Node %s, α=%.2e",
+                         dia_name, len(node_ids), master_id, alpha)
+
+        if d_vals:
+            n = self.dm.total_dofs
+            self.K = (self.K + coo_matrix((d_vals, (d_rows, d_cols)), shape=(n, n))).tocsr()
 
     def _get_exact_fef_via_stiffness(self, L, a, P_vec_local, mat, sec, M_vec_local=None):
         """
@@ -207,17 +352,8 @@ class GlobalAssembler:
         
         b = L - a
   
-        k_left = get_local_stiffness_matrix(
-            E=mat['E'], G=mat['G'], A=sec['A'], J=sec['J'],
-            I22=sec['I22'], I33=sec['I33'],
-            As2=sec['As2'], As3=sec['As3'], L=a, L_tor=a
-        )
-        
-        k_right = get_local_stiffness_matrix(
-            E=mat['E'], G=mat['G'], A=sec['A'], J=sec['J'],
-            I22=sec['I22'], I33=sec['I33'],
-            As2=sec['As2'], As3=sec['As3'], L=b, L_tor=b
-        )
+        k_left = _k_local(mat, sec, a, a)
+        k_right = _k_local(mat, sec, b, b)
         
         K_mid = k_left[6:12, 6:12] + k_right[0:6, 0:6]
         
@@ -228,7 +364,7 @@ class GlobalAssembler:
             F_mid[3:6] = M_vec_local
         
         try:
-            U_mid = np.linalg.solve(K_mid, F_mid)
+            U_mid = solve(K_mid, F_mid, assume_a='pos')
         except np.linalg.LinAlgError:
             return np.zeros(12)
             
@@ -263,9 +399,7 @@ class GlobalAssembler:
         F_c = fef_local[idx_c]                                          
         
         try:
-                                                    
-            K_cc_inv = np.linalg.inv(K_cc)
-            correction = K_kc @ (K_cc_inv @ F_c)
+            correction = K_kc @ solve(K_cc, F_c, assume_a='pos')
             
             F_k_new = F_k - correction
             
@@ -276,7 +410,7 @@ class GlobalAssembler:
             return fef_new
             
         except np.linalg.LinAlgError:
-            print("Warning: Unstable release configuration in load condensation.")
+            logger.warning("Unstable release configuration in load condensation.")
             return fef_local
 
     def _add_member_loads(self):
@@ -286,6 +420,7 @@ class GlobalAssembler:
         """
         print("Assembler: Processing Member Loads (FEF)...")
         active_patterns = {pat: scale for pat, scale in self.dm.load_case['patterns']}
+        elem_by_id = {e['id']: e for e in self.dm.elements}
         
         for load in self.dm.raw['loads']:
                              
@@ -294,7 +429,7 @@ class GlobalAssembler:
             
             scale = active_patterns[load['pattern']]
             
-            el = next((e for e in self.dm.elements if e['id'] == load['element_id']), None)
+            el = elem_by_id.get(load['element_id'])
             if not el: continue
             
             L_clear = el['L_clear']
@@ -308,15 +443,10 @@ class GlobalAssembler:
             
             mat = el['material']
             sec = el['section']
-            k_raw = get_local_stiffness_matrix(
-                E=mat['E'], G=mat['G'], A=sec['A'], J=sec['J'],
-                I22=sec['I22'], I33=sec['I33'],
-                As2=sec['As2'], As3=sec['As3'], 
-                L=L_clear, L_tor=L_total
-            )
+            k_raw = _k_local(mat, sec, L_clear, L_total)
 
             fef_local = np.zeros(12)
-            R_3x3 = get_rotation_matrix(p1, p2, el['beta'])
+            R_3x3 = el['_R']
 
             w_vec_local_for_offset = np.zeros(3) 
 
@@ -340,13 +470,9 @@ class GlobalAssembler:
                 wx, wy, wz = w_local
                 w_vec_local_for_offset = w_local                               
 
-                fef_local[0] = -wx * L_clear / 2;    fef_local[6] = -wx * L_clear / 2
-                                    
-                fef_local[1] = -wy * L_clear / 2;    fef_local[7] = -wy * L_clear / 2
-                fef_local[5] = -wy * L_clear**2/12;  fef_local[11]=  wy * L_clear**2/12
-                                    
-                fef_local[2] = -wz * L_clear / 2;    fef_local[8] = -wz * L_clear / 2
-                fef_local[4] =  wz * L_clear**2/12;  fef_local[10]= -wz * L_clear**2/12
+                fef_local = _FEF_DIST_M @ np.array(
+                    [wx * L_clear, wy * L_clear, wz * L_clear,
+                     wy * L_clear**2, wz * L_clear**2])
 
             elif load['type'] == 'member_point':
                 P_val = load['force'] * scale
@@ -383,24 +509,12 @@ class GlobalAssembler:
 
             self.spy.record_fef(el['id'], fef_local)
             
-            T_rot = np.zeros((12, 12))
-            for i in range(4): T_rot[i*3:(i+1)*3, i*3:(i+1)*3] = R_3x3
-
-            glob_off_i = np.array(el['offsets'][0])
-            glob_off_j = np.array(el['offsets'][1])
-
-            loc_off_insertion_i = R_3x3 @ glob_off_i
-            loc_off_insertion_j = R_3x3 @ glob_off_j
-
-            loc_off_total_i = loc_off_insertion_i.copy()
-            loc_off_total_j = loc_off_insertion_j.copy()
-            loc_off_total_i[0] += ri
-            loc_off_total_j[0] -= rj
-
-            T_ecc = get_eccentricity_matrix(loc_off_total_i, loc_off_total_j)
-            T_total = T_ecc @ T_rot
-
-            fef_global = T_total.T @ fef_local
+            loc_off_insertion_i, loc_off_insertion_j = el['_off_ins']
+            if el['_plain']:
+                # T_total is four copies of R on the diagonal: R^T per 3-block.
+                fef_global = (fef_local.reshape(4, 3) @ R_3x3).ravel()
+            else:
+                fef_global = el['_T_total'].T @ fef_local
 
             if load['type'] == 'member_dist' and (ri > 0 or rj > 0):
                 wx, wy, wz = w_vec_local_for_offset
@@ -443,17 +557,12 @@ class GlobalAssembler:
         Returns: (index, sign)
         index: 0=X, 1=Y, 2=Z
         """
-        d = str(dir_str).upper()                         
-        
-        if "GRAVITY" in d: 
-            return 2, -1.0
-            
-        if "X" in d or "1" in d: return 0, 1.0
-        if "Y" in d or "2" in d: return 1, 1.0
-        if "Z" in d or "3" in d: return 2, 1.0
-        
-        print(f"Warning: Unknown load direction '{dir_str}'. Defaulting to Zero.")
-        return None, 0.0
+        d = str(dir_str).upper().strip()
+        hit = _DIR_MAP.get(d) or _legacy_direction(d)
+        if hit is None:
+            logger.warning("Unknown load direction '%s'. Defaulting to Zero.", dir_str)
+            return None, 0.0
+        return hit
 
     def _apply_projection_factor(self, w_local, p1, p2, L_total, coord_system):
         """
@@ -474,7 +583,7 @@ class GlobalAssembler:
         """
                                                                     
         if coord_system != "Global":
-            print(f"Warning: Projected loads only supported in Global coordinates. Ignoring projection.")
+            logger.warning("Projected loads only supported in Global coordinates. Ignoring projection.")
             return w_local
         
         dx = p2[0] - p1[0]
@@ -482,18 +591,19 @@ class GlobalAssembler:
         L_horizontal = np.sqrt(dx**2 + dy**2)
         
         if L_horizontal < 1e-9:
-            print(f"Warning: Member is vertical. Projected horizontal load = 0.")
+            logger.warning("Member is vertical. Projected horizontal load = 0.")
             return np.array([0.0, 0.0, 0.0])
         
         if L_total < 1e-9:
-            print(f"Warning: Zero-length member detected.")
+            logger.warning("Zero-length member detected.")
             return w_local
         
         proj_factor = L_horizontal / L_total
         
         w_scaled = w_local * proj_factor
         
-        print(f"   Projected Load: Original intensity = {np.linalg.norm(w_local):.2f}, "
-            f"Scaled = {np.linalg.norm(w_scaled):.2f} (factor = {proj_factor:.4f})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Projected Load: Original intensity = %.2f, Scaled = %.2f (factor = %.4f)",
+                         np.linalg.norm(w_local), np.linalg.norm(w_scaled), proj_factor)
         
         return w_scaled
@@ -19,6 +19,7 @@ class DataManager:
         
         self.nodes = []                                      
         self.elements = []                                      
+        self._element_table = None
         self.load_case = None                                       
         self.total_dofs = 0                                      
 
@@ -177,6 +178,25 @@ class DataManager:
                                                    
                 raise SolverException("E103", f"Element {el_data['id']} references missing section: {e}")
 
+    def element_table(self):
+        """
+        The elements as one structured array with fields A, rho, L (L_total),
+        node_i, node_j, beta and offsets (2x3), built on first call. The dicts
+        in self.elements stay the source of truth.
+        """
+        if self._element_table is None:
+            t = np.zeros(len(self.elements), dtype=[
+                ('A', 'f8'), ('rho', 'f8'), ('L', 'f8'),
+                ('node_i', 'i8'), ('node_j', 'i8'),
+                ('beta', 'f8'), ('offsets', 'f8', (2, 3)),
+            ])
+            for k, el in enumerate(self.elements):
+                idx_i, idx_j = el['node_indices']
+                t[k] = (el['section']['A'], el['material']['rho'], el['L_total'],
+                        idx_i, idx_j, el['beta'], el['offsets'])
+            self._element_table = t
+        return self._element_table
+
     def _prepare_load_case(self, case_name):
                                 
         case_data = next((c for c in self.raw['load_cases'] if c['name'] == case_name), None)
@@ -118,6 +118,34 @@ def get_rotation_matrix(p1, p2, beta_deg):
     
     return R
 
+def get_rotation_matrices(p1, p2, beta_deg):
+    """
+    Batched get_rotation_matrix: p1, p2 are (N, 3) end points and beta_deg
+    is (N,). Returns the (N, 3, 3) rotations, without the per-element log.
+    """
+    V_x = np.asarray(p2, dtype=float) - np.asarray(p1, dtype=float)
+    n = len(V_x)
+    L = np.linalg.norm(V_x, axis=1)
+    zero = L == 0
+    vx = V_x / np.where(zero, 1.0, L)[:, None]
+
+    temp_v = np.zeros((n, 3))
+    near_z = np.abs(vx[:, 2]) > 0.999
+    temp_v[near_z, 0] = 1.0
+    temp_v[~near_z, 2] = 1.0
+
+    vy = np.cross(temp_v, vx)
+    norm_vy = np.linalg.norm(vy, axis=1)
+    vy /= np.where(norm_vy == 0, 1.0, norm_vy)[:, None]
+    vz = np.cross(vx, vy)
+
+    beta_rad = np.radians(np.asarray(beta_deg, dtype=float))
+    c, s = np.cos(beta_rad)[:, None], np.sin(beta_rad)[:, None]
+
+    R = np.stack([vx, vy * c + vz * s, -vy * s + vz * c], axis=1)
+    R[zero] = np.eye(3)
+    return R
+
 def get_eccentricity_matrix(off_i, off_j):
     Te = np.eye(12)
     def apply_offset(node_idx, offset):
@@ -2,10 +2,18 @@
 import json
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class MatrixSpy:
     def __init__(self, output_path):
         self.output_path = output_path
         self.data = {}
+        self._batch_ids = []
+        self._batch_k = None
+        self._batch_t = None
 
     def record_matrices(self, elem_id, k_local, t_matrix):
         """Captures Stiffness and Transformation matrices."""
@@ -15,8 +23,20 @@ class MatrixSpy:
         self.data[elem_id]["k"] = k_local
         self.data[elem_id]["t"] = t_matrix
 
+    def record_batch(self, elem_ids, k_locals, t_matrices):
+        """
+        Captures Stiffness and Transformation matrices for every element at
+        once: k_locals and t_matrices are (N, 12, 12), row n for elem_ids[n].
+        Nothing is kept when there is no output file.
+        """
+        if not self.output_path: return
+        self._batch_ids = list(elem_ids)
+        self._batch_k = k_locals
+        self._batch_t = t_matrices
+
     def record_fef(self, elem_id, fef_local):
         """Accumulates Fixed End Forces (handles multiple loads on one member)."""
+        if not self.output_path: return
         if elem_id not in self.data:
                                                                           
             self.data[elem_id] = {"k": None, "t": None, "fef": np.zeros(12)}
@@ -28,16 +48,28 @@ class MatrixSpy:
         if not self.output_path: return
 
         export_dict = {}
+        if self._batch_ids:
+            # One tolist() per stack is much cheaper than one per element.
+            k_all = self._batch_k.tolist()
+            t_all = self._batch_t.tolist()
+            for n, eid in enumerate(self._batch_ids):
+                export_dict[eid] = {"k": k_all[n], "t": t_all[n], "fef": [0.0] * 12}
+
         for eid, mats in self.data.items():
-            export_dict[eid] = {
-                "k": mats["k"].tolist() if mats["k"] is not None else None,
-                "t": mats["t"].tolist() if mats["t"] is not None else None,
-                "fef": mats["fef"].tolist()
-            }
+            entry = export_dict.setdefault(eid, {"k": None, "t": None})
+            if mats["k"] is not None:
+                entry["k"] = mats["k"].tolist()
+            if mats["t"] is not None:
+                entry["t"] = mats["t"].tolist()
+            entry["fef"] = mats["fef"].tolist()
         
         try:
-            with open(self.output_path, 'w') as f:
-                json.dump(export_dict, f, indent=4)
+            if orjson is not None:
+                with open(self.output_path, 'wb') as f:
+                    f.write(orjson.dumps(export_dict, option=orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(self.output_path, 'w') as f:
+                    json.dump(export_dict, f, separators=(",", ":"))
             print(f"MatrixSpy: Successfully exported element matrices to {self.output_path}")
         except Exception as e:
             print(f"MatrixSpy Error: Could not save file. {e}")
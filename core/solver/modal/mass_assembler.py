@@ -1,11 +1,114 @@
 import numpy as np
-from scipy.sparse import lil_matrix
+from scipy.sparse import diags
+from element_library import get_rotation_matrices
+
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:
+    njit = None
+
+# Below this many member loads numba's thread start-up outweighs the gain.
+PARALLEL_MIN_LOADS = 20000
+# The parallel scatter zeroes and reduces one (threads, dofs) buffer, so the
+# six writes per load must outweigh that many times over.
+PARALLEL_WORK_RATIO = 4
+
+try:
+    import cupy as cp
+    import cupyx
+except ImportError:
+    cp = None
+
+# Only models this large, with this many loads, amortize the host <-> device copies.
+GPU_MIN_DOFS  = 1_000_000
+GPU_MIN_LOADS = 200_000
+
+_gpu_ok = None
+
+def _gpu_available():
+    """Probes for a CUDA device once, the first time a model is big enough to use it."""
+    global _gpu_ok
+    if _gpu_ok is None:
+        try:
+            _gpu_ok = cp is not None and cp.cuda.runtime.getDeviceCount() > 0
+        except Exception:     # driver missing or no usable device
+            _gpu_ok = False
+    return _gpu_ok
+
+if njit is not None:
+    @njit(cache=True)
+    def _scatter_ends_nb(F_accum, nodes_i, nodes_j, vec, r_i, r_j):
+        for n in range(vec.shape[0]):
+            di = nodes_i[n] * 6
+            dj = nodes_j[n] * 6
+            for c in range(3):
+                F_accum[di + c] += vec[n, c] * r_i[n]
+                F_accum[dj + c] += vec[n, c] * r_j[n]
+
+    @njit(parallel=True, cache=True)
+    def _scatter_ends_par_nb(F_accum, nodes_i, nodes_j, vec, r_i, r_j, n_chunks):
+        # Loads on the same node may land in different chunks, so every chunk
+        # sums into its own row and the rows are reduced at the end.
+        n = vec.shape[0]
+        step = (n + n_chunks - 1) // n_chunks
+        part = np.zeros((n_chunks, F_accum.shape[0]), dtype=F_accum.dtype)
+        for t in prange(n_chunks):
+            for m in range(t * step, min(n, (t + 1) * step)):
+                di = nodes_i[m] * 6
+                dj = nodes_j[m] * 6
+                for c in range(3):
+                    part[t, di + c] += vec[m, c] * r_i[m]
+                    part[t, dj + c] += vec[m, c] * r_j[m]
+        for d in prange(F_accum.shape[0]):
+            acc = 0.0
+            for t in range(n_chunks):
+                acc += part[t, d]
+            F_accum[d] += acc
+
+def _scatter_ends(F_accum, nodes_i, nodes_j, vec, r_i, r_j):
+    """Adds vec * r_i to node i and vec * r_j to node j (Ux, Uy, Uz) for every load."""
+    if (len(F_accum) >= GPU_MIN_DOFS and len(vec) >= GPU_MIN_LOADS
+            and _gpu_available()):
+        xyz = np.arange(3)
+        dofs = np.concatenate([(nodes_i[:, None] * 6 + xyz).ravel(),
+                               (nodes_j[:, None] * 6 + xyz).ravel()])
+        vals = np.concatenate([(vec * r_i[:, None]).ravel(),
+                               (vec * r_j[:, None]).ravel()])
+        F_gpu = cp.zeros(len(F_accum), dtype=F_accum.dtype)
+        cupyx.scatter_add(F_gpu, cp.asarray(dofs), cp.asarray(vals, dtype=F_accum.dtype))
+        F_accum += F_gpu.get()
+        return
+    if njit is not None:
+        vec = np.ascontiguousarray(vec)
+        n_threads = get_num_threads()
+        if (len(vec) >= PARALLEL_MIN_LOADS
+                and len(vec) * 6 >= PARALLEL_WORK_RATIO * n_threads * len(F_accum)):
+            _scatter_ends_par_nb(F_accum, nodes_i, nodes_j, vec, r_i, r_j, n_threads)
+        else:
+            _scatter_ends_nb(F_accum, nodes_i, nodes_j, vec, r_i, r_j)
+        return
+    F_xyz = F_accum.reshape(-1, 6)[:, :3]
+    np.add.at(F_xyz, nodes_i, vec * r_i[:, None])
+    np.add.at(F_xyz, nodes_j, vec * r_j[:, None])
+
+# How a member_point load's direction is resolved (see _load_table).
+_PT_GRAVITY, _PT_GLOBAL, _PT_LOCAL, _PT_NONE = range(4)
 
 class GlobalMassAssembler:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, precision="fp64"):
         self.dm = data_manager
         self.total_dofs = self.dm.total_dofs
-        self.M = lil_matrix((self.total_dofs, self.total_dofs))
+        # precision="fp32" halves the accumulators' memory traffic; M itself
+        # is always handed to the eigensolver as float64.
+        self.dtype = np.float32 if precision == "fp32" else np.float64
+        # Lumped mass is diagonal: accumulate M[i, i] in a vector and turn it
+        # into a sparse matrix once at the end of build_mass_matrix.
+        self.m_diag = np.zeros(self.total_dofs, dtype=self.dtype)
+        self.M = None
+        self._elem_A = None
+        self._R_cache = {}
+        self._p1_adj = None
+        self._loads = None
         print(" [DEBUG] Initialized Mass Assembler (V4 - Net Force Method)")
 
     def build_mass_matrix(self, mass_source_name):
@@ -14,16 +117,28 @@ class GlobalMassAssembler:
         ms_def = self._find_mass_source(mass_source_name)
         if not ms_def:
             print(f"Error: Mass Source '{mass_source_name}' not found. Using zero mass.")
-            return self.M
+            return self._to_csr()
 
-        if ms_def.get("include_self_mass", True):
-            self._add_element_self_mass()
+        # Plain self-mass and pattern self-weight share one pass over the
+        # elements; only their scale factors add up.
+        self_scale = 1.0 if ms_def.get("include_self_mass", True) else 0.0
 
         if ms_def.get("include_patterns", False):
             patterns = ms_def.get("load_patterns", []) 
-            self._add_mass_from_net_loads(patterns)
+            self_scale += self._add_mass_from_net_loads(patterns)
+
+        if self_scale > 0.0:
+            self._add_element_self_mass(scale_factor=self_scale)
+
+        self._to_csr()
+        print(f"Mass Assembler: Mass Matrix Assembled. Non-zeros: {int(np.count_nonzero(self.m_diag))}")
+        return self.M
+
+    def _add_diagonal(self, dofs, values):
+        np.add.at(self.m_diag, dofs, values)
 
-        print(f"Mass Assembler: Mass Matrix Assembled. Non-zeros: {self.M.nnz}")
+    def _to_csr(self):
+        self.M = diags(self.m_diag.astype(np.float64, copy=False), format='csr')
         return self.M
 
     def _find_mass_source(self, name):
@@ -40,40 +155,148 @@ class GlobalMassAssembler:
                 elif isinstance(sources, dict): return list(sources.values())[0]
         return None
 
+    def _element_arrays(self):
+        """Per-element A, rho, L and node indices, from DataManager.element_table()."""
+        if self._elem_A is None:
+            t = self.dm.element_table()
+            self._elem_A = t['A']
+            self._elem_rho = t['rho']
+            self._elem_L = t['L']
+            self._elem_nodes = np.stack([t['node_i'], t['node_j']], axis=1)
+        return self._elem_A, self._elem_rho, self._elem_L, self._elem_nodes
+
+    def _end_points(self):
+        """Offset-adjusted end coordinates of every element, (N_elem, 3) each."""
+        if self._p1_adj is None:
+            coords = np.array([n['coords'] for n in self.dm.nodes], dtype=float).reshape(-1, 3)
+            offsets = self.dm.element_table()['offsets']
+            nodes = self._element_arrays()[3]
+            self._p1_adj = coords[nodes[:, 0]] + offsets[:, 0]
+            self._p2_adj = coords[nodes[:, 1]] + offsets[:, 1]
+        return self._p1_adj, self._p2_adj
+
+    def _rotations(self, e_idx):
+        """
+        3x3 rotations for the element indices in e_idx, each element computed
+        once per assembler. Reuses the R GlobalAssembler stored on the element
+        when K was assembled first.
+        """
+        uniq, inv = np.unique(e_idx, return_inverse=True)
+        missing = []
+        for k in uniq.tolist():
+            if k not in self._R_cache:
+                R_k = self.dm.elements[k].get('_R')
+                if R_k is None:
+                    missing.append(k)
+                else:
+                    self._R_cache[k] = R_k
+        if missing:
+            p1_adj, p2_adj = self._end_points()
+            beta = self.dm.element_table()['beta'][missing]
+            for k, R_k in zip(missing, get_rotation_matrices(p1_adj[missing], p2_adj[missing], beta)):
+                self._R_cache[k] = R_k
+        R = np.array([self._R_cache[k] for k in uniq.tolist()]).reshape(-1, 3, 3)
+        return R[inv.ravel()]
+
     def _add_element_self_mass(self, scale_factor=1.0):
         print(f"   -> Adding Element Self-Mass (Lumped, Scale={scale_factor:.2f})...")
-        for el in self.dm.elements:
-            A = el['section']['A']
-            rho = el['material']['rho'] 
-            L = el['L_total']
-            g = 9.80665
-            mass_density = rho / g
-                                          
-            total_mass = A * mass_density * L * scale_factor 
-            
-            for n_idx in el['node_indices']:
-                start_dof = n_idx * 6
-                half_mass = total_mass / 2.0
-                
-                self.M[start_dof + 0, start_dof + 0] += half_mass
-                self.M[start_dof + 1, start_dof + 1] += half_mass
-                self.M[start_dof + 2, start_dof + 2] += half_mass
+        A, rho, L, nodes = self._element_arrays()
+        g = 9.80665
+
+        half_mass = A * (rho / g) * L * scale_factor / 2.0
+        # Ux, Uy, Uz of both end nodes: six entries per element.
+        dofs = (nodes[:, :, None] * 6 + np.arange(3)).ravel()
+        self._add_diagonal(dofs, np.repeat(half_mass, 6))
+
+    def _load_table(self):
+        """
+        Sorts the nodal / member loads of every pattern into per-type column
+        arrays, once per assembler. Returns (nodal, dist, point), each a tuple
+        whose first column is the pattern id from self._pat_id.
+        """
+        if self._loads is not None:
+            return self._loads
+
+        elem_idx = {e['id']: k for k, e in enumerate(self.dm.elements)}
+        pat_id = {}
+        nodal, dist, point = [], [], []
+
+        for load in self.dm.raw.get("loads", []):
+            if load["type"] == "nodal":
+                node_idx = self.dm.node_id_to_idx.get(load["node_id"])
+                if node_idx is None: continue
+                p = pat_id.setdefault(load["pattern"], len(pat_id))
+                nodal.append((p, node_idx, load.get("fx", 0.0), load.get("fy", 0.0),
+                              load.get("fz", 0.0)))
+
+            elif load["type"] == "member_dist":
+                k = elem_idx.get(load['element_id'])
+                if k is None: continue
+                p = pat_id.setdefault(load["pattern"], len(pat_id))
+                dist.append((p, k, load.get('wx', 0.0), load.get('wy', 0.0), load.get('wz', 0.0),
+                             load.get('coord', 'Global') == 'Local'))
+
+            elif load["type"] == "member_point":
+                k = elem_idx.get(load['element_id'])
+                if k is None: continue
+                p = pat_id.setdefault(load["pattern"], len(pat_id))
+
+                direction = load.get('dir', 'Gravity')
+                coord = load.get('coord', 'Global')
+
+                if direction == "Gravity":
+                    kind, axis = _PT_GRAVITY, 2
+                elif coord == "Global":
+                    kind, axis = _PT_GLOBAL, 0 if "X" in direction else (1 if "Y" in direction else 2)
+                elif coord == "Local":
+                    kind, axis = _PT_LOCAL, 0 if "1" in direction else (1 if "2" in direction else 2)
+                else:
+                    kind, axis = _PT_NONE, 0
+
+                point.append((p, k, kind, axis, load.get('force', 0.0),
+                              load.get('dist', 0.5), load.get('is_rel', True)))
+
+        nodal = np.array(nodal, dtype=float).reshape(-1, 5)
+        dist = np.array(dist, dtype=float).reshape(-1, 6)
+        point = np.array(point, dtype=float).reshape(-1, 7)
+        i8 = np.int64
+
+        # Point-load position as a fraction of L_total, and the resulting
+        # share of the load at end i / end j.
+        pt_elem = point[:, 1].astype(i8)
+        L = self._element_arrays()[2]
+        d = np.where(point[:, 6] != 0, point[:, 5], point[:, 5] / L[pt_elem])
+        ratios = np.stack([1.0 - d, d], axis=1)
+
+        self._pat_id = pat_id
+        self._loads = (
+            (nodal[:, 0].astype(i8), nodal[:, 1].astype(i8), nodal[:, 2:5]),
+            (dist[:, 0].astype(i8), dist[:, 1].astype(i8), dist[:, 2:5], dist[:, 5] != 0),
+            (point[:, 0].astype(i8), pt_elem, point[:, 2].astype(np.int8),
+             point[:, 3].astype(i8), point[:, 4], ratios),
+        )
+        return self._loads
 
     def _add_mass_from_net_loads(self, pattern_list):
+        """
+        Adds mass for the net downward nodal force of the given patterns.
+        Returns the self-weight factor those patterns contribute, for the
+        caller's single self-mass pass.
+        """
         print("   -> Calculating Net Nodal Forces (Algebraic Sum)...")
         g = 9.80665
-        from element_library import get_rotation_matrix
         
-        F_accum = np.zeros(self.total_dofs)
+        F_accum = np.zeros(self.total_dofs, dtype=self.dtype)
         
         active_patterns = {}
         for item in pattern_list:
              if isinstance(item, list): active_patterns[item[0]] = item[1]
              elif isinstance(item, dict): active_patterns[item["name"]] = item["scale"]
 
-        if not active_patterns: return
+        if not active_patterns: return 0.0
 
         raw_patterns = self.dm.raw.get("load_patterns", []) 
+        sw_factor = 0.0
         
         for pat_name, multiplier in active_patterns.items():
             sw_mult = 0.0
@@ -86,97 +309,73 @@ class GlobalMassAssembler:
             total_sw_factor = multiplier * sw_mult
             if total_sw_factor > 1e-6:
                 print(f"   -> Load Pattern '{pat_name}' has self-weight ({sw_mult}). Adding to mass matrix...")
-                self._add_element_self_mass(scale_factor=total_sw_factor)
-                
-        for load in self.dm.raw.get("loads", []):
-            pat = load["pattern"]
-            if pat not in active_patterns: continue
-            
-            multiplier = active_patterns[pat]
-            
-            if load["type"] == "nodal":
-                node_idx = self.dm.node_id_to_idx[load["node_id"]]
-                start_dof = node_idx * 6
+                sw_factor += total_sw_factor
                 
-                F_accum[start_dof + 0] += load.get("fx", 0.0) * multiplier
-                F_accum[start_dof + 1] += load.get("fy", 0.0) * multiplier
-                F_accum[start_dof + 2] += load.get("fz", 0.0) * multiplier
+        nodal, dist, point = self._load_table()
+        _, _, L, nodes = self._element_arrays()
 
-            elif load["type"] == "member_dist":
-                el = next((e for e in self.dm.elements if e['id'] == load['element_id']), None)
-                if not el: continue
-                
-                w_vec = np.array([load.get('wx', 0.0), load.get('wy', 0.0), load.get('wz', 0.0)])
-                
-                if load.get('coord', 'Global') == 'Local':
-                    idx_i, idx_j = el['node_indices']
-                    p1_adj = self.dm.nodes[idx_i]['coords'] + np.array(el['offsets'][0])
-                    p2_adj = self.dm.nodes[idx_j]['coords'] + np.array(el['offsets'][1])
-                    R = get_rotation_matrix(p1_adj, p2_adj, el['beta'])
-                    w_global = R.T @ w_vec
-                else:
-                    w_global = w_vec
-                
-                F_total = w_global * el['L_total'] * multiplier
-                
-                for n_idx in el['node_indices']:
-                    dof = n_idx * 6
-                    F_accum[dof + 0] += F_total[0] / 2.0
-                    F_accum[dof + 1] += F_total[1] / 2.0
-                    F_accum[dof + 2] += F_total[2] / 2.0
+        # Pattern multipliers by pattern id; inactive patterns stay at zero
+        # and their loads are dropped below.
+        pattern_scale = np.zeros(len(self._pat_id))
+        for pat_name, multiplier in active_patterns.items():
+            if pat_name in self._pat_id:
+                pattern_scale[self._pat_id[pat_name]] = multiplier
 
-            elif load["type"] == "member_point":
-                el = next((e for e in self.dm.elements if e['id'] == load['element_id']), None)
-                if not el: continue
+        # _pat_id only holds patterns that carry loads, so this also
+        # covers mass sources whose patterns have no loads at all.
+        if not pattern_scale.any():
+            print("   -> No loads in the active patterns. Skipping net-force mass.")
+            return sw_factor
 
-                force = load.get('force', 0.0)
-                direction = load.get('dir', 'Gravity')
-                coord = load.get('coord', 'Global')
+        def active(bucket):
+            mult = pattern_scale[bucket[0]]
+            sel = mult != 0.0
+            if not sel.any():
+                return None
+            return (mult[sel],) + tuple(col[sel] for col in bucket[1:])
 
-                F_vec_global = np.zeros(3)
-                
-                if direction == "Gravity":
+        nodal, dist, point = active(nodal), active(dist), active(point)
 
-                    F_vec_global[2] = -abs(force) 
-                elif coord == "Global":
-                    idx = 0 if "X" in direction else (1 if "Y" in direction else 2)
-                    F_vec_global[idx] = force
-                elif coord == "Local":
-                    local_vec = np.zeros(3)
-                    idx = 0 if "1" in direction else (1 if "2" in direction else 2)
-                    local_vec[idx] = force
-                    
-                    idx_i, idx_j = el['node_indices']
-                    p1_adj = self.dm.nodes[idx_i]['coords'] + np.array(el['offsets'][0])
-                    p2_adj = self.dm.nodes[idx_j]['coords'] + np.array(el['offsets'][1])
-                    R = get_rotation_matrix(p1_adj, p2_adj, el['beta'])
-                    F_vec_global = R.T @ local_vec
-
-                F_vec_global *= multiplier
-
-                dist = load.get('dist', 0.5)
-                if not load.get('is_rel', True): dist = dist / el['L_total']
-                
-                ratios = [1.0 - dist, dist] 
-                
-                for k, n_idx in enumerate(el['node_indices']):
-                    dof = n_idx * 6
-                    F_accum[dof + 0] += F_vec_global[0] * ratios[k]
-                    F_accum[dof + 1] += F_vec_global[1] * ratios[k]
-                    F_accum[dof + 2] += F_vec_global[2] * ratios[k]
+        if nodal is not None:
+            mult, node_idx, f = nodal
+            np.add.at(F_accum.reshape(-1, 6)[:, :3], node_idx, f * mult[:, None])
+
+        # Member loads of both kinds as one table: the vector as defined, a
+        # Local-coordinates flag, a scale, and the share going to each end.
+        members = []
+
+        if dist is not None:
+            mult, e_idx, w, local = dist
+            half = np.full(len(e_idx), 0.5)
+            members.append((e_idx, w, local, L[e_idx] * mult, half, half))
+
+        if point is not None:
+            mult, e_idx, kind, axis, force, ratios = point
+            vec = np.zeros((len(e_idx), 3))
+            directed = (kind == _PT_GLOBAL) | (kind == _PT_LOCAL)
+            vec[directed, axis[directed]] = force[directed]
+            grav = kind == _PT_GRAVITY
+            vec[grav, 2] = -np.abs(force[grav])
+
+            members.append((e_idx, vec, kind == _PT_LOCAL, mult, ratios[:, 0], ratios[:, 1]))
+
+        if members:
+            e_idx, vec, local, scale, r_i, r_j = (np.concatenate(c) for c in zip(*members))
+            if local.any():
+                # Every Local-coordinates vector goes to global in one R^T contraction.
+                R = self._rotations(e_idx[local])
+                vec[local] = np.einsum('nji,nj->ni', R, vec[local])
+            F = vec * scale[:, None]
+            _scatter_ends(F_accum, nodes[e_idx, 0], nodes[e_idx, 1], F, r_i, r_j)
 
         print("   -> Converting NET Gravity Forces to Mass...")
-        mass_added_count = 0
+        Fz = F_accum[2::6]
+        mask = Fz < -1e-5
+        mass = np.where(mask, -Fz / g, 0.0)
 
-        for i in range(2, self.total_dofs, 6):
-            Fz_net = F_accum[i]
-            
-            if Fz_net < -1e-5:
-                mass_val = abs(Fz_net) / g
-                
-                self.M[i-2, i-2] += mass_val
-                self.M[i-1, i-1] += mass_val
-                self.M[i,   i]   += mass_val
-                mass_added_count += 1
+        # Same mass on Ux, Uy, Uz of each node (total_dofs is 6 per node).
+        self.m_diag.reshape(-1, 6)[:, :3] += mass[:, None]
+        mass_added_count = int(mask.sum())
             
         print(f"   -> Added Net Mass to {mass_added_count} nodes.")
+        return sw_factor
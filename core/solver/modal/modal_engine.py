@@ -59,8 +59,9 @@ def run_modal_analysis(input_json_path, output_json_path, target_case_name="MODA
         
         modal_case_def = next((c for c in dm.raw['load_cases'] if c['name'] == target_case_name), None)
         ms_name = modal_case_def.get("mass_source", "Default") if modal_case_def else "Default"
+        precision = modal_case_def.get("mass_precision", "fp64") if modal_case_def else "fp64"
         
-        mass_assembler = GlobalMassAssembler(dm)
+        mass_assembler = GlobalMassAssembler(dm, precision=precision)
         M_full = mass_assembler.build_mass_matrix(ms_name)
 
         if M_full.nnz == 0 or M_full.diagonal().sum() < 1e-9:
@@ -0,0 +1,56 @@
+"""
+Runs a real last_login flush. Uses MONGO_TEST_URI when set (a throwaway
+database on that server), otherwise mongomock; skipped if neither is available.
+"""
+import logging
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from app.auth import db
+
+
+@pytest.fixture
+def users(monkeypatch):
+    uri = os.getenv("MONGO_TEST_URI")
+    if uri:
+        from pymongo import MongoClient
+        client = MongoClient(uri, serverSelectionTimeoutMS=5000)
+    else:
+        mongomock = pytest.importorskip("mongomock")
+        client = mongomock.MongoClient()
+    test_db = client["opencivil_test_login_writer"]
+    monkeypatch.setattr(db.Database, "_db", test_db)
+    yield test_db["users"]
+    client.drop_database("opencivil_test_login_writer")
+
+
+def test_flush_sets_last_login(users, caplog):
+    users.insert_one({"email": "user@example.com", "last_login": None})
+    ts = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    writer = db._LoginTimestampWriter()
+    writer._queue.put_nowait(("user@example.com", ts))
+    with caplog.at_level(logging.ERROR, logger=db.logger.name):
+        writer.flush()
+
+    assert not caplog.records
+    doc = users.find_one({"email": "user@example.com"})
+    assert doc["last_login"].replace(tzinfo=timezone.utc) == ts
+
+
+def test_flush_keeps_latest_timestamp_per_email(users):
+    users.insert_one({"email": "user@example.com", "last_login": None})
+    older = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    newer = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+    writer = db._LoginTimestampWriter()
+    writer._queue.put_nowait(("user@example.com", newer))
+    writer._queue.put_nowait(("user@example.com", older))
+    writer.flush()
+
+    doc = users.find_one({"email": "user@example.com"})
+    assert doc["last_login"].replace(tzinfo=timezone.utc) == newer